@@ -0,0 +1,97 @@
+# app/admission.py
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class Overloaded(Exception):
+    """Raised when every slot is busy and the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server busy; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """At most `max_concurrent` runs at once and `max_queue` more waiting (FIFO).
+
+    Anything beyond that is turned away immediately with a Retry-After hint
+    estimated from recent run times, rather than piling up in memory.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queue: int = 32, min_retry_after: int = 1):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.min_retry_after = min_retry_after
+        self.running = 0
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(max_concurrent)
+        # Moving average of how long a run holds its slot
+        self._avg_seconds = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until a queued request would likely get a slot."""
+        backlog = (self.waiting + 1) / self.max_concurrent
+        return max(self.min_retry_after, math.ceil(self._avg_seconds * backlog))
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()` once a slot is free; raises Overloaded if the queue is full."""
+        if self.running >= self.max_concurrent and self.waiting >= self.max_queue:
+            raise Overloaded(self.retry_after())
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        start = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            self.running -= 1
+            self._sem.release()
+            self._avg_seconds += 0.2 * (time.perf_counter() - start - self._avg_seconds)
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key onto one execution.
+
+    Every caller awaits the same task; it is cancelled only once all of them
+    have given up (deadline or disconnect), so one impatient caller does not
+    cut the run short for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Result of `fn()`, run once per key at a time, and whether it was shared with an earlier caller."""
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
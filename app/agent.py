@@ -1,19 +1,164 @@
 import os
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import partial
+from typing import Any, List, Optional
+from pydantic import PrivateAttr
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_tool_calling_agent, AgentExecutor
+from langchain_core.agents import AgentAction, AgentStep
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.prompts import MessagesPlaceholder
-from .tools import get_weather, create_task_tools
-from .db import TodoApp
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from .tools import get_weather, create_task_tools, WRITE_TOOLS, DEFAULT_OUTPUT_BUDGET
+from .db import AsyncTodoApp, TodoApp
+from .cache import ResponseCache, CachedExecutor
+from .callbacks import MetricsCallbackHandler
 
 
-def create_agent_executor(api_key: str, app: TodoApp) -> AgentExecutor:
+class _Turn:
+    """Tool calls the model made in one turn, and their results once run."""
+
+    def __init__(self) -> None:
+        self.actions: List[AgentAction] = []
+        self.steps: Optional[List[AgentStep]] = None
+        self.next = 0
+        # Async path: the turn's write calls, run together once
+        self.writes: List[AgentAction] = []
+        self.batch: Optional[asyncio.Future] = None
+
+
+# The async turn in progress; the base class's gather tasks inherit it
+_turn_var: contextvars.ContextVar[Optional[_Turn]] = contextvars.ContextVar("agent_turn", default=None)
+
+
+def _unwrap(result: Any) -> Any:
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+class ParallelAgentExecutor(AgentExecutor):
+    """AgentExecutor that runs the tool calls of one model turn together.
+
+    Reads and weather lookups run concurrently. The turn's task writes run
+    back to back in one short transaction on the writer
+    (`TodoApp.write_batch`), so no transaction stays open while other tools
+    wait on the network. Results reach the model in the order it made the calls.
+    """
+
+    app: Any = None
+    max_tool_workers: int = 8
+    _local: Any = PrivateAttr(default_factory=threading.local)
+
+    def _batched(self, action: AgentAction) -> bool:
+        return self.app is not None and action.tool in WRITE_TOOLS
+
+    # ---------------- sync ----------------
+    def _iter_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager=None):
+        # The base class yields every action of a turn before performing any of
+        # them, so the turn is complete by the first _perform_agent_action call.
+        turn = self._local.turn = _Turn()
+        try:
+            for item in super()._iter_next_step(
+                name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager
+            ):
+                if isinstance(item, AgentAction):
+                    turn.actions.append(item)
+                yield item
+        finally:
+            self._local.turn = None
+
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None) -> AgentStep:
+        perform = super()._perform_agent_action
+        turn = getattr(self._local, "turn", None)
+        if turn is None or len(turn.actions) < 2:
+            return perform(name_to_tool_map, color_mapping, agent_action, run_manager)
+        if turn.steps is None:
+            turn.steps = self._perform_all(perform, turn.actions, name_to_tool_map, color_mapping, run_manager)
+        # Called once per action, in order
+        step = turn.steps[turn.next]
+        turn.next += 1
+        return step
+
+    def _perform_all(self, perform, actions, name_to_tool_map, color_mapping, run_manager) -> List[AgentStep]:
+        writes = [a for a in actions if self._batched(a)]
+        with ThreadPoolExecutor(max_workers=min(len(actions), self.max_tool_workers)) as pool:
+            # Copied contexts keep the request id on pool threads' log lines
+            def submit(fn, *args):
+                return pool.submit(contextvars.copy_context().run, fn, *args)
+
+            batch = submit(self.app.write_batch, [
+                partial(perform, name_to_tool_map, color_mapping, a, run_manager) for a in writes
+            ]) if writes else None
+            others = {
+                id(a): submit(perform, name_to_tool_map, color_mapping, a, run_manager)
+                for a in actions if not self._batched(a)
+            }
+            written = dict(zip(map(id, writes), batch.result())) if batch else {}
+            return [_unwrap(written[id(a)]) if id(a) in written else others[id(a)].result() for a in actions]
+
+    # ---------------- async ----------------
+    async def _aiter_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager=None):
+        # The base class yields the turn's actions, then gathers their
+        # _aperform_agent_action calls; those tasks see this turn
+        turn = _Turn()
+        token = _turn_var.set(turn)
+        try:
+            async for item in super()._aiter_next_step(
+                name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager
+            ):
+                if isinstance(item, AgentAction):
+                    turn.actions.append(item)
+                    if self._batched(item):
+                        turn.writes.append(item)
+                yield item
+        finally:
+            _turn_var.reset(token)
+
+    async def _aperform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None) -> AgentStep:
+        turn = _turn_var.get()
+        if turn is None or len(turn.writes) < 2 or not self._batched(agent_action):
+            return await super()._aperform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+        if turn.batch is None:
+            # The first write to get here runs all of them on the writer, via the sync tool path
+            perform = super()._perform_agent_action
+            sync_manager = run_manager.get_sync() if run_manager else None
+            calls = [partial(perform, name_to_tool_map, color_mapping, a, sync_manager) for a in turn.writes]
+            if isinstance(self.app, AsyncTodoApp):
+                turn.batch = asyncio.ensure_future(self.app.run_write(self.app.write_batch, calls))
+            else:
+                turn.batch = asyncio.ensure_future(asyncio.to_thread(self.app.write_batch, calls))
+        # Shielded: one cancelled caller must not fail the others' results
+        results = await asyncio.shield(turn.batch)
+        return _unwrap(next(r for a, r in zip(turn.writes, results) if a is agent_action))
+
+
+def create_agent_executor(
+    api_key: str,
+    app: TodoApp,
+    cache: ResponseCache | None = None,
+    llm: BaseChatModel | None = None,
+    output_budget: int = DEFAULT_OUTPUT_BUDGET,
+    parallel_tools: bool = False,
+) -> Runnable | CachedExecutor:
+    """Build the tool-calling agent. `llm` overrides ChatOpenAI (e.g. a fake model in benchmarks).
+
+    `output_budget` caps the approximate tokens a task tool returns.
+    `parallel_tools` selects ParallelAgentExecutor.
+    Returns the executor bound to the metrics callback (a Runnable), wrapped
+    in a CachedExecutor when `cache` is given; both offer invoke/ainvoke.
+    """
     os.environ["OPENAI_API_KEY"] = api_key
 
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    if llm is None:
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
-    tools = [get_weather, *create_task_tools(app)]
+    tools = [get_weather, *create_task_tools(app, output_budget)]
 
     today_iso = date.today().isoformat()
     tool_help = (
@@ -21,12 +166,22 @@ def create_agent_executor(api_key: str, app: TodoApp) -> AgentExecutor:
         f"Today is {today_iso}. If a user gives a date without a year, assume the current year "
         f"and prefer ISO YYYY-MM-DD when you return due dates.\n"
         "- add_task_tool(title, description, due_date)\n"
-        "- get_all_tasks_tool()\n"
+        "- get_all_tasks_tool(completed, after_id) — compact 'id|done|due|title|notes' lines, cut off at a budget\n"
+        "- search_tasks_tool(query, limit) — keyword search; use it to find a specific task instead of listing all\n"
+        "- task_summary_tool() — counts: total, open, completed, overdue, due this week\n"
+        "- overdue_tasks_tool(limit), upcoming_tasks_tool(limit, within_days) — open tasks by due date\n"
+        "Answer counting and deadline questions with the summary/overdue/upcoming tools rather than listing everything.\n"
         "- update_task_tool(task_id, title, description, due_date, completed)\n"
         "- delete_task_tool(task_id)\n"
+        "- add_tasks_tool(tasks=[{title, description, due_date}, ...])\n"
+        "- update_tasks_tool(task_ids, title, description, due_date, completed)\n"
+        "- delete_tasks_tool(task_ids)\n"
+        "When the same change applies to several tasks, use one batch tool call instead of many single ones.\n"
         "- get_weather(location, date='today'|'tomorrow')\n"
+        "Resolve 'it', 'that one' and similar from the conversation so far and the recently referenced task IDs "
+        "before searching or listing.\n"
         "If the user asks for CRUD on tasks, pick the matching tool."
-        "Rules: Before creating a new task, first check if it already exists (by title, allow fuzzy match) using get_task_status_tool or by listing tasks."
+        "Rules: Before creating a new task, first check if it already exists (by title, allow fuzzy match) using search_tasks_tool rather than listing all tasks."
         "If it exists, prefer update_task_tool over add_task_tool. If it's already completed and the user asks to complete it again, just confirm."
     )
 
@@ -46,11 +201,23 @@ def create_agent_executor(api_key: str, app: TodoApp) -> AgentExecutor:
             + tool_help,
             
         ),
+        # Windowed per-session history; absent for one-off requests
+        MessagesPlaceholder("chat_history", optional=True),
         ("human", "{input}"),
         # REQUIRED for tool-calling agent
         MessagesPlaceholder("agent_scratchpad"),
     ])
 
     agent = create_tool_calling_agent(llm, tools, prompt)
-    executor = AgentExecutor(agent=agent, tools=tools, verbose=False, handle_parsing_errors=True)
+    # Intermediate steps tell the response cache whether a write tool ran and
+    # sessions which tasks a turn touched
+    options = dict(
+        agent=agent, tools=tools, verbose=False, handle_parsing_errors=True,
+        return_intermediate_steps=True,
+    )
+    executor = ParallelAgentExecutor(app=app, **options) if parallel_tools else AgentExecutor(**options)
+    # Inheritable callbacks reach every nested LLM and tool run
+    executor = executor.with_config(callbacks=[MetricsCallbackHandler()])
+    if cache is not None:
+        return CachedExecutor(executor, app, cache, WRITE_TOOLS)
     return executor
\ No newline at end of file
@@ -1,20 +1,127 @@
 # app/api.py
 import os
+import json
+import asyncio
+import time
+import uuid
+import hashlib
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from dataclasses import asdict
+from datetime import time as dt_time
+from typing import AsyncIterator, List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from app.logging_config import configure_logging
-from app.db import TodoApp
+from app.logging_config import configure_logging, request_id_var
+from app.db import AsyncTodoApp
+from app.date_utils import normalize_due_date, parse_due_date
+from app.models import Task, TaskChange
 from app.agent import create_agent_executor
+from app.tools import DEFAULT_OUTPUT_BUDGET
+from app.router import arun_command, is_read_only, route, ROUTE_FAST, ROUTE_AGENT
+from app.weather import aset_provider
+from app.cache import build_cache, normalize_input
+from app.session import Session, build_session_store
+from app.admission import AdmissionLimiter, Overloaded, SingleFlight
+from app.changes import ChangeFeed
+from app.reminders import LeaderLock, ReminderScheduler
+from app import transfer
+from app import metrics
 
 class CommandRequest(BaseModel):
     input: str
+    # Requests sharing a session_id see each other's recent turns
+    session_id: Optional[str] = None
 
 class CommandResponse(BaseModel):
     output: str
+    handled_by: str = "agent"
+    elapsed_ms: float | None = None
+
+class BatchRequest(BaseModel):
+    inputs: List[str]
+    concurrency: Optional[int] = None
+
+class BatchItem(BaseModel):
+    index: int
+    output: Optional[str] = None
+    error: Optional[str] = None
+    handled_by: Optional[str] = None
+    elapsed_ms: Optional[float] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchItem]
+
+class TaskOut(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    due_date: Optional[str] = None
+    completed: bool
+
+class TaskPage(BaseModel):
+    items: List[TaskOut]
+    next_cursor: Optional[int] = None
+
+class TaskCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    due_date: Optional[str] = None
+
+class ChangeOut(BaseModel):
+    version: int
+    id: int
+    deleted: bool
+    task: Optional[TaskOut] = None
+
+class ChangePage(BaseModel):
+    changes: List[ChangeOut]
+    # Pass back as `since` to continue from here
+    version: int
+    has_more: bool = False
+
+class TaskPatch(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    due_date: Optional[str] = None
+    completed: Optional[bool] = None
+
+def _task_out(task: Task) -> TaskOut:
+    return TaskOut(**{**asdict(task), "completed": bool(task.completed)})
+
+def _change_page(changes: List[TaskChange], since: int, limit: int) -> ChangePage:
+    return ChangePage(
+        changes=[
+            ChangeOut(version=c.version, id=c.task_id, deleted=c.task is None,
+                      task=_task_out(c.task) if c.task else None)
+            for c in changes[:limit]
+        ],
+        version=changes[min(limit, len(changes)) - 1].version if changes else since,
+        has_more=len(changes) > limit,
+    )
+
+def _date_bound(name: str, value: Optional[str]) -> Optional[str]:
+    """ISO date for a due-date filter; 422 if it isn't a date."""
+    if value is None:
+        return None
+    parsed = parse_due_date(value)
+    if parsed is None:
+        raise HTTPException(status_code=422, detail=f"{name} must be a date such as 2025-10-07, got {value!r}")
+    return parsed.isoformat()
+
+def _etag(payload: dict) -> str:
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -26,12 +133,77 @@ async def lifespan(app: FastAPI):
         raise RuntimeError("OPENAI_API_KEY not set")
 
     db_path = os.getenv("TODO_DB", "todo.db")
-    app.state.db = TodoApp(db_name=db_path)
-    app.state.agent = create_agent_executor(api_key, app.state.db)
+    app.state.db = AsyncTodoApp(
+        db_name=db_path,
+        readers=int(os.getenv("TODO_DB_READERS", "4")),
+        group_commit_ms=float(os.getenv("TODO_GROUP_COMMIT_MS", "0")),
+        busy_timeout_ms=float(os.getenv("TODO_DB_BUSY_TIMEOUT_MS", "5000")),
+        write_retries=int(os.getenv("TODO_DB_WRITE_RETRIES", "5")),
+    )
+    app.state.cache = build_cache(
+        os.getenv("TODO_RESPONSE_CACHE", "memory"),
+        path=os.getenv("TODO_RESPONSE_CACHE_PATH", "response_cache.db"),
+        max_entries=int(os.getenv("TODO_RESPONSE_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("TODO_RESPONSE_CACHE_TTL", "300")),
+    )
+    app.state.agent = create_agent_executor(
+        api_key, app.state.db, cache=app.state.cache,
+        output_budget=int(os.getenv("TODO_TOOL_OUTPUT_TOKENS", str(DEFAULT_OUTPUT_BUDGET))),
+        parallel_tools=os.getenv("TODO_PARALLEL_TOOLS", "0").lower() in ("1", "true", "yes"),
+    )
+    # Worker processes don't share memory, so sessions default to SQLite under `serve --workers`
+    workers = int(os.getenv("TODO_WORKERS", "1"))
+    session_store = os.getenv("TODO_SESSION_STORE", "sqlite" if workers > 1 else "memory")
+    if workers > 1 and session_store.strip().lower() == "memory":
+        logging.warning(
+            "TODO_SESSION_STORE=memory with %s workers: a session's turns are only seen by the worker "
+            "that served them; use sqlite or sticky routing", workers,
+        )
+    app.state.sessions = build_session_store(
+        session_store,
+        path=os.getenv("TODO_SESSION_STORE_PATH", "sessions.db"),
+        max_sessions=int(os.getenv("TODO_SESSIONS_MAX", "1000")),
+        ttl=float(os.getenv("TODO_SESSION_TTL", "1800")),
+        max_turns=int(os.getenv("TODO_SESSION_TURNS", "6")),
+    )
+    app.state.changes = ChangeFeed(
+        app.state.db,
+        interval=float(os.getenv("TODO_CHANGES_POLL_MS", "250")) / 1000,
+        batch_limit=int(os.getenv("TODO_CHANGES_BATCH", "500")),
+    )
+    app.state.reminders = None
+    if os.getenv("TODO_REMINDERS", "0").lower() in ("1", "true", "yes"):
+        app.state.reminders = ReminderScheduler(
+            app.state.db, app.state.changes,
+            remind_at=dt_time.fromisoformat(os.getenv("TODO_REMIND_AT", "09:00")),
+            horizon_days=int(os.getenv("TODO_REMINDER_HORIZON_DAYS", "7")),
+            # Every `serve --workers` process builds one; only the lock holder fires reminders
+            lock=LeaderLock(db_path + ".reminders.lock"),
+        )
+        app.state.reminders.start()
+    app.state.agent_limiter = AdmissionLimiter(
+        max_concurrent=int(os.getenv("TODO_AGENT_MAX_CONCURRENCY", "8")),
+        max_queue=int(os.getenv("TODO_AGENT_MAX_QUEUE", "32")),
+    )
+    # Seconds a /agent request may take, queueing included; 0 disables
+    app.state.agent_timeout = float(os.getenv("TODO_AGENT_TIMEOUT", "60")) or None
+    app.state.single_flight = (
+        SingleFlight() if os.getenv("TODO_AGENT_SINGLE_FLIGHT", "1").lower() in ("1", "true", "yes") else None
+    )
+    app.state.batch_concurrency = int(os.getenv("TODO_BATCH_CONCURRENCY", "4"))
+    app.state.batch_max_concurrency = int(os.getenv("TODO_BATCH_MAX_CONCURRENCY", "16"))
+    app.state.batch_max_items = int(os.getenv("TODO_BATCH_MAX_ITEMS", "100"))
     try:
         yield
     finally:
+        if app.state.reminders is not None:
+            await app.state.reminders.close()
+        app.state.changes.close()
+        app.state.sessions.close()
         app.state.db.close()
+        if app.state.cache is not None:
+            app.state.cache.close()
+        await aset_provider(None)
 
 app = FastAPI(title="AI Todo API", version="1.0.0", lifespan=lifespan)
 
@@ -41,14 +213,32 @@ app.add_middleware(
     allow_methods=["*"], allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    # Tag every log line emitted while serving this request
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex[:16]
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 @app.get("/")
 async def root():
     return {
         "hello": "AI Todo API",
         "try": {
             "health": "GET /health",
+            "metrics": "GET /metrics",
             "docs": "GET /docs",
-            "agent": "POST /agent  body: {\"input\": \"show all tasks\"}"
+            "agent": "POST /agent  body: {\"input\": \"show all tasks\", \"session_id\": \"optional\"}",
+            "agent_stream": "POST /agent/stream  (Server-Sent Events)",
+            "tasks": "GET /tasks?completed=false&due_from=2025-10-01&limit=50&after=<next_cursor>",
+            "export": "GET /tasks/export?format=ndjson|csv",
+            "import": "POST /tasks/import?format=ndjson|csv  body: the file",
+            "changes": "GET /tasks/changes?since=<version>  or WebSocket /tasks/ws?since=<version>",
         }
     }
 
@@ -56,15 +246,294 @@ async def root():
 async def health():
     return {"status": "ok"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    cache = app.state.cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await asyncio.to_thread(cache.stats)}
+
 @app.post("/agent", response_model=CommandResponse)
 async def agent_endpoint(req: CommandRequest):
+    """Run one command under admission control.
+
+    Past the concurrency limit and its wait queue, requests get 429 with
+    Retry-After; a run that outlives TODO_AGENT_TIMEOUT is cancelled (504).
+    Identical read-only inputs arriving together share one run.
+    """
+    session = app.state.sessions.get(req.session_id) if req.session_id else None
+    extra = session.prompt_inputs() if session else {}
+
+    def run():
+        return app.state.agent_limiter.run(lambda: arun_command(req.input, app.state.db, app.state.agent, **extra))
+
+    flight = app.state.single_flight
     try:
-        result = await app.state.agent.ainvoke({"input": req.input})
-        output = result.get("output")
-        if output is None:
-            # Be defensive in case the agent returns something unexpected
-            output = str(result)
-        return CommandResponse(output=output)
+        # Chat history makes the same words mean different things per session
+        if flight is not None and not extra and is_read_only(req.input):
+            result, shared = await asyncio.wait_for(flight.do(normalize_input(req.input), run), app.state.agent_timeout)
+        else:
+            result, shared = await asyncio.wait_for(run(), app.state.agent_timeout), False
+    except Overloaded as e:
+        metrics.AGENT_REJECTED.inc("overloaded")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except asyncio.TimeoutError:
+        metrics.AGENT_REJECTED.inc("timeout")
+        raise HTTPException(status_code=504, detail=f"Agent run exceeded {app.state.agent_timeout:g}s and was cancelled")
     except Exception as e:
         logging.exception("Agent invocation failed")
         raise HTTPException(status_code=500, detail=str(e))
+    if shared:
+        metrics.AGENT_SHARED.inc()
+    if session:
+        session.record(req.input, result.output, result.steps)
+    return CommandResponse(output=result.output, handled_by=result.handled_by, elapsed_ms=result.elapsed_ms)
+
+@app.post("/agent/batch", response_model=BatchResponse)
+async def agent_batch(req: BatchRequest):
+    """Run many commands with at most `concurrency` in flight; results come back in input order.
+
+    Writes stay consistent because every tool write goes through the
+    database's single writer; one failing item does not affect the others.
+    """
+    if len(req.inputs) > app.state.batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {app.state.batch_max_items} inputs per batch")
+    concurrency = req.concurrency or app.state.batch_concurrency
+    concurrency = max(1, min(concurrency, app.state.batch_max_concurrency))
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, text: str) -> BatchItem:
+        async with sem:
+            try:
+                result = await arun_command(text, app.state.db, app.state.agent)
+                return BatchItem(index=index, output=result.output, handled_by=result.handled_by,
+                                 elapsed_ms=result.elapsed_ms)
+            except Exception as e:
+                logging.exception("Batch item %s failed", index)
+                return BatchItem(index=index, error=str(e))
+
+    results = await asyncio.gather(*(run_one(i, text) for i, text in enumerate(req.inputs)))
+    return BatchResponse(results=list(results))
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _agent_events(text: str, session: Optional[Session] = None) -> AsyncIterator[str]:
+    """Translate the agent's async event stream into SSE frames.
+
+    Emits `tool_start`/`tool_end` around each tool call, `token` for every
+    chunk of answer text, then a single `final` (or `error`) frame.
+    """
+    start = time.perf_counter()
+    try:
+        output = await asyncio.to_thread(route, text, app.state.db)
+        if output is not None:
+            if session:
+                session.record(text, output)
+            yield _sse("final", {"output": output, "handled_by": ROUTE_FAST,
+                                 "elapsed_ms": (time.perf_counter() - start) * 1000})
+            return
+        output, steps = None, []
+        extra = session.prompt_inputs() if session else {}
+        async for event in app.state.agent.astream_events({"input": text, **extra}, version="v2"):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                # Tool-calling turns stream empty content; only forward answer text
+                if isinstance(content, str) and content:
+                    yield _sse("token", {"text": content})
+            elif kind == "on_tool_start":
+                yield _sse("tool_start", {"tool": event["name"], "input": event["data"].get("input")})
+            elif kind == "on_tool_end":
+                yield _sse("tool_end", {"tool": event["name"], "output": event["data"].get("output")})
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                result = event["data"].get("output")
+                output = result.get("output") if isinstance(result, dict) else result
+                steps = (result.get("intermediate_steps") or []) if isinstance(result, dict) else []
+        if session:
+            session.record(text, output or "", steps)
+        yield _sse("final", {"output": output if output is not None else "", "handled_by": ROUTE_AGENT,
+                             "elapsed_ms": (time.perf_counter() - start) * 1000})
+    except Exception as e:
+        logging.exception("Agent stream failed")
+        yield _sse("error", {"detail": str(e)})
+
+@app.post("/agent/stream")
+async def agent_stream(req: CommandRequest):
+    return StreamingResponse(
+        _agent_events(req.input, app.state.sessions.get(req.session_id) if req.session_id else None),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ---------------- Direct task endpoints (no LLM) ----------------
+@app.get("/tasks", response_model=TaskPage)
+async def list_tasks(
+    request: Request,
+    response: Response,
+    completed: Optional[bool] = None,
+    due_from: Optional[str] = None,
+    due_to: Optional[str] = None,
+    after: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    q: Optional[str] = Query(None, description="Full-text search; results are ranked and not paginated"),
+):
+    if q is not None:
+        tasks = await app.state.db.asearch_tasks(q, limit=limit, completed=completed)
+        page = TaskPage(items=[_task_out(t) for t in tasks])
+    else:
+        # Fetch one extra row to learn whether another page exists
+        tasks = await app.state.db.alist_tasks(
+            completed=completed,
+            due_from=_date_bound("due_from", due_from),
+            due_to=_date_bound("due_to", due_to),
+            after_id=after,
+            limit=limit + 1,
+        )
+        page = TaskPage(
+            items=[_task_out(t) for t in tasks[:limit]],
+            next_cursor=tasks[limit - 1].id if len(tasks) > limit else None,
+        )
+    etag = _etag(page.model_dump())
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return page
+
+async def _export_stream(fmt: str, chunk_size: int) -> AsyncIterator[str]:
+    start, rows = time.perf_counter(), 0
+    yield transfer.header(fmt)
+    async for chunk in app.state.db.aiter_tasks(chunk_size):
+        yield transfer.encode_chunk(chunk, fmt)
+        rows += len(chunk)
+    seconds = time.perf_counter() - start
+    logging.info("Exported %s task(s) in %.2fs (%.0f rows/s)", rows, seconds, rows / seconds if seconds else 0)
+
+@app.get("/tasks/export")
+async def export_tasks(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    chunk_size: int = Query(1000, ge=1, le=10000),
+):
+    """Every task, streamed a chunk at a time."""
+    return StreamingResponse(
+        _export_stream(fmt, chunk_size),
+        media_type=transfer.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{fmt}"'},
+    )
+
+@app.post("/tasks/import")
+async def import_tasks(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(transfer.IMPORT_BATCH, ge=1, le=10000),
+):
+    """Add the tasks in the request body (ids are reassigned); returns rows and rows/sec.
+
+    The body is parsed as it arrives, on a worker thread that pulls chunks
+    from the event loop, and written one transaction per batch.
+    """
+    loop = asyncio.get_running_loop()
+    body = request.stream()
+
+    def chunks():
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(body.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+
+    try:
+        stats = await asyncio.to_thread(
+            transfer.import_tasks, app.state.db, transfer.parse_rows(transfer.iter_lines(chunks()), fmt), batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Import stopped at {e}; batches before it were kept")
+    logging.info("Imported %s task(s) in %.2fs (%.0f rows/s)", stats.rows, stats.seconds, stats.rows_per_sec)
+    return stats.as_dict()
+
+@app.get("/tasks/changes", response_model=ChangePage)
+async def task_changes(
+    since: Optional[int] = Query(None, description="version from the previous page; omit to get the current version"),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Inserts, edits and deletes after `since`, oldest first."""
+    db = app.state.db
+    if since is None:
+        return ChangePage(changes=[], version=await db.arow_version())
+    return _change_page(await db.achanges_since(since, limit + 1), since, limit)
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    # Clients don't have to send anything; reading only notices when they leave
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+@app.websocket("/tasks/ws")
+async def task_changes_ws(websocket: WebSocket, since: Optional[int] = None):
+    """Push a ChangePage whenever tasks change after `since` (default: now)."""
+    await websocket.accept()
+    feed = app.state.changes
+    if since is None:
+        since = await app.state.db.arow_version()
+    closed = asyncio.ensure_future(_until_disconnect(websocket))
+    try:
+        while True:
+            waiter = asyncio.ensure_future(feed.wait(since))
+            await asyncio.wait({waiter, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed.done():
+                waiter.cancel()
+                break
+            try:
+                changes = waiter.result()
+            except Exception:
+                logging.exception("Change feed fetch failed for a WebSocket subscriber")
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+                break
+            page = _change_page(changes, since, feed.batch_limit)
+            await websocket.send_json(page.model_dump())
+            since = page.version
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+
+@app.get("/tasks/{task_id}", response_model=TaskOut)
+async def get_task(task_id: int, request: Request, response: Response):
+    task = await app.state.db.aget_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    out = _task_out(task)
+    etag = _etag(out.model_dump())
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return out
+
+@app.post("/tasks", response_model=TaskOut, status_code=201)
+async def create_task(body: TaskCreate):
+    task_id = await app.state.db.aadd_task(body.title, body.description, normalize_due_date(body.due_date))
+    return _task_out(await app.state.db.aget_task(task_id))
+
+@app.patch("/tasks/{task_id}", response_model=TaskOut)
+async def patch_task(task_id: int, body: TaskPatch):
+    db = app.state.db
+    if await db.aget_task(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await db.aupdate_task(
+        task_id,
+        title=body.title,
+        description=body.description,
+        due_date=normalize_due_date(body.due_date),
+        completed=body.completed,
+    )
+    return _task_out(await db.aget_task(task_id))
+
+@app.delete("/tasks/{task_id}", status_code=204)
+async def delete_task(task_id: int):
+    if not await app.state.db.adelete_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    return Response(status_code=204)
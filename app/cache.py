@@ -0,0 +1,229 @@
+# app/cache.py
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Iterable, Optional, Tuple
+from .db import TodoApp
+
+
+def normalize_input(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip().lower()).rstrip(".!?")
+
+
+# ---------------- Backends ----------------
+class MemoryBackend:
+    """In-process LRU map of key -> (expires_at, output)."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, output: str, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, output)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """Same contract as MemoryBackend, persisted to a SQLite file so entries survive restarts."""
+
+    def __init__(self, path: str = "response_cache.db", max_entries: int = 5000):
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                output TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT output, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        return row[0]
+
+    def put(self, key: str, output: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, output, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, output, now + ttl, now),
+            )
+            # Evict least recently used rows beyond the limit
+            self.conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ---------------- Cache ----------------
+class ResponseCache:
+    """Agent outputs keyed by (normalized input, today, TodoApp.data_version).
+
+    Any write bumps data_version, so stale entries simply stop matching and age
+    out of the LRU. The TTL bounds staleness of non-DB answers such as weather.
+    """
+
+    def __init__(self, backend=None, ttl: float = 300.0):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    @staticmethod
+    def key(text: str, version: int) -> str:
+        raw = f"{normalize_input(text)}\x00{date.today().isoformat()}\x00{version}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, text: str, version: int) -> Optional[str]:
+        output = self.backend.get(self.key(text, version))
+        if output is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return output
+
+    def put(self, text: str, version: int, output: str) -> None:
+        self.backend.put(self.key(text, version), output, self.ttl)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped_writes": self.skipped,
+            "entries": len(self.backend),
+        }
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+class CachedExecutor:
+    """Wraps an AgentExecutor with a ResponseCache; same invoke/ainvoke interface.
+
+    The executor must return intermediate steps so runs that called a write
+    tool can be recognised and left out of the cache.
+    """
+
+    def __init__(self, executor: Any, app: TodoApp, cache: ResponseCache, write_tools: Iterable[str]):
+        self.executor = executor
+        self.app = app
+        self.cache = cache
+        self.write_tools = set(write_tools)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.executor, name)
+
+    def _lookup(self, text: str) -> Tuple[int, Optional[str]]:
+        version = self.app.data_version
+        return version, self.cache.get(text, version)
+
+    def _store(self, text: str, version: int, result: Any) -> None:
+        if not isinstance(result, dict) or result.get("output") is None:
+            return
+        steps = result.get("intermediate_steps") or []
+        if any(getattr(action, "tool", None) in self.write_tools for action, _ in steps):
+            self.cache.skipped += 1
+            return
+        # A concurrent write landed mid-run: the answer may mix old and new data
+        if self.app.data_version != version:
+            self.cache.skipped += 1
+            return
+        self.cache.put(text, version, result["output"])
+
+    def invoke(self, inputs: dict, *args: Any, **kwargs: Any) -> Any:
+        text = inputs.get("input", "")
+        # The same words can mean something else mid-conversation ("is it done?")
+        if inputs.get("chat_history"):
+            return self.executor.invoke(inputs, *args, **kwargs)
+        version, cached = self._lookup(text)
+        if cached is not None:
+            logging.debug("Response cache hit for '%s'", text)
+            return {"input": text, "output": cached, "cached": True}
+        result = self.executor.invoke(inputs, *args, **kwargs)
+        self._store(text, version, result)
+        return result
+
+    async def ainvoke(self, inputs: dict, *args: Any, **kwargs: Any) -> Any:
+        text = inputs.get("input", "")
+        if inputs.get("chat_history"):
+            return await self.executor.ainvoke(inputs, *args, **kwargs)
+        # Both the version read and a SQLite backend touch disk
+        version, cached = await asyncio.to_thread(self._lookup, text)
+        if cached is not None:
+            logging.debug("Response cache hit for '%s'", text)
+            return {"input": text, "output": cached, "cached": True}
+        result = await self.executor.ainvoke(inputs, *args, **kwargs)
+        await asyncio.to_thread(self._store, text, version, result)
+        return result
+
+
+def build_cache(kind: str, path: str = "response_cache.db", max_entries: int = 512, ttl: float = 300.0) -> Optional[ResponseCache]:
+    """Return a ResponseCache for `kind` ("memory", "sqlite" or "off")."""
+    kind = (kind or "off").strip().lower()
+    if kind in ("", "off", "none", "0"):
+        return None
+    if kind == "memory":
+        return ResponseCache(MemoryBackend(max_entries), ttl=ttl)
+    if kind == "sqlite":
+        return ResponseCache(SQLiteBackend(path, max_entries), ttl=ttl)
+    raise ValueError(f"Unknown response cache backend: {kind}")
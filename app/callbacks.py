@@ -0,0 +1,154 @@
+# app/callbacks.py
+import threading
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from . import metrics
+
+
+class _RunStats:
+    __slots__ = ("start", "tool_calls", "prompt_tokens", "completion_tokens")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.tool_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Feeds app.metrics from LangChain callbacks: tool and LLM latency, plus
+    tool iterations and token usage per top-level agent run.
+
+    Attached as an inheritable callback so it sees every nested run; child runs
+    are attributed to their root through `parent_run_id`.
+    """
+
+    # Bookkeeping only; no need to hop to a thread in async runs
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._root_of: Dict[UUID, UUID] = {}
+        self._runs: Dict[UUID, _RunStats] = {}
+        self._started: Dict[UUID, tuple] = {}
+
+    # ---------------- helpers ----------------
+    def _link(self, run_id: UUID, parent_run_id: Optional[UUID]) -> Optional[_RunStats]:
+        with self._lock:
+            root = self._root_of.get(parent_run_id, parent_run_id) if parent_run_id else run_id
+            self._root_of[run_id] = root
+            return self._runs.get(root)
+
+    def _start(self, run_id: UUID, component: str, name: str) -> None:
+        metrics.IN_FLIGHT.inc(component)
+        with self._lock:
+            self._started[run_id] = (component, name, time.perf_counter())
+
+    def _finish(self, run_id: UUID, error: bool = False) -> Optional[tuple]:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            self._root_of.pop(run_id, None)
+        if started is None:
+            return None
+        component, name, start = started
+        metrics.IN_FLIGHT.dec(component)
+        if error:
+            metrics.ERRORS.inc(component, name)
+        return component, name, time.perf_counter() - start
+
+    # ---------------- agent runs ----------------
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        if parent_run_id is None:
+            with self._lock:
+                self._runs[run_id] = _RunStats()
+                self._root_of[run_id] = run_id
+            metrics.IN_FLIGHT.inc("agent")
+        else:
+            self._link(run_id, parent_run_id)
+
+    def _end_chain(self, run_id: UUID, error: bool) -> None:
+        with self._lock:
+            stats = self._runs.pop(run_id, None)
+            self._root_of.pop(run_id, None)
+        if stats is None:
+            return
+        metrics.IN_FLIGHT.dec("agent")
+        metrics.AGENT_SECONDS.observe(time.perf_counter() - stats.start)
+        metrics.AGENT_TOOL_ITERATIONS.observe(stats.tool_calls)
+        metrics.AGENT_TOKENS.observe(stats.prompt_tokens, "prompt")
+        metrics.AGENT_TOKENS.observe(stats.completion_tokens, "completion")
+        if error:
+            metrics.ERRORS.inc("agent", "run")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, error=False)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, error=True)
+
+    # ---------------- tools ----------------
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID,
+                      parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        stats = self._link(run_id, parent_run_id)
+        if stats is not None:
+            stats.tool_calls += 1
+        self._start(run_id, "tool", (serialized or {}).get("name") or kwargs.get("name") or "unknown")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        done = self._finish(run_id)
+        if done:
+            metrics.TOOL_SECONDS.observe(done[2], done[1])
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        done = self._finish(run_id, error=True)
+        if done:
+            metrics.TOOL_SECONDS.observe(done[2], done[1])
+
+    # ---------------- LLM ----------------
+    def _llm_start(self, serialized: Dict[str, Any], run_id: UUID, parent_run_id: Optional[UUID], kwargs: Dict) -> None:
+        self._link(run_id, parent_run_id)
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or (serialized or {}).get("name") or "unknown"
+        self._start(run_id, "llm", model)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID,
+                     parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._llm_start(serialized, run_id, parent_run_id, kwargs)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._llm_start(serialized, run_id, parent_run_id, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            stats = self._runs.get(self._root_of.get(run_id))
+        done = self._finish(run_id)
+        if done:
+            metrics.LLM_SECONDS.observe(done[2], done[1])
+        if stats is not None:
+            prompt, completion = _token_usage(response)
+            stats.prompt_tokens += prompt
+            stats.completion_tokens += completion
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        done = self._finish(run_id, error=True)
+        if done:
+            metrics.LLM_SECONDS.observe(done[2], done[1])
+
+
+def _token_usage(response: LLMResult) -> tuple:
+    """(prompt, completion) tokens from either llm_output or per-message usage metadata."""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens", 0) or 0, usage.get("completion_tokens", 0) or 0
+    prompt = completion = 0
+    for generations in response.generations:
+        for gen in generations:
+            meta = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+            prompt += meta.get("input_tokens", 0) or 0
+            completion += meta.get("output_tokens", 0) or 0
+    return prompt, completion
@@ -0,0 +1,74 @@
+# app/changes.py
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from .db import AsyncTodoApp
+from .models import TaskChange
+
+
+class ChangeFeed:
+    """Wakes subscribers when tasks change, using one poller per process.
+
+    The poller reads the row_version counter every `interval` seconds, and
+    only while someone is subscribed. That also catches commits from other
+    worker processes. Waiting subscribers share a single event, so an idle
+    client costs one suspended coroutine. Subscribers asking for the same
+    range share one fetch.
+    """
+
+    def __init__(self, db: AsyncTodoApp, interval: float = 0.25, batch_limit: int = 500):
+        self.db = db
+        self.interval = interval
+        self.batch_limit = batch_limit
+        self.version = 0
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._poller: Optional[asyncio.Task] = None
+        self._batch_key: Optional[Tuple[int, int]] = None
+        self._batch: Optional[asyncio.Future] = None
+
+    async def wait(self, since: int) -> List[TaskChange]:
+        """Changes after `since`, waiting until there are some.
+
+        Returns up to `batch_limit` + 1 of them; the extra one tells a pager there is more.
+        """
+        self._subscribers += 1
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            while self.version <= since:
+                await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+        return await self._fetch(since)
+
+    async def _fetch(self, since: int) -> List[TaskChange]:
+        key = (since, self.version)
+        if self._batch_key != key:
+            self._batch_key = key
+            self._batch = asyncio.ensure_future(self.db.achanges_since(since, self.batch_limit + 1))
+        batch = self._batch
+        try:
+            return await asyncio.shield(batch)
+        except Exception:
+            # Don't hand a failed fetch to the next subscriber
+            if self._batch is batch:
+                self._batch_key = None
+            raise
+
+    async def _poll(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            try:
+                version = await self.db.arow_version()
+            except Exception:
+                logging.exception("Change feed poll failed")
+                continue
+            if version != self.version:
+                self.version = version
+                event, self._changed = self._changed, asyncio.Event()
+                event.set()
+
+    def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
@@ -1,11 +1,23 @@
 import logging
 from datetime import datetime
 from .db import TodoApp
-from .agent import create_agent_executor
+from .date_utils import normalize_due_date
+from .router import LazyAgent, run_command, list_tasks, add_task, delete_task
+from .cache import ResponseCache
+from .session import Session
+
+
+def _build_agent(api_key: str, app: TodoApp):
+    # Deferred: importing app.agent pulls in LangChain and the OpenAI client
+    from .agent import create_agent_executor
+    return create_agent_executor(api_key, app, cache=ResponseCache())
 
 
 def run_cli(api_key: str, app: TodoApp) -> None:
-    agent_executor = create_agent_executor(api_key, app)
+    # Built on the first command the fast path can't handle
+    agent_executor = LazyAgent(lambda: _build_agent(api_key, app))
+    # One conversation for the whole interactive run
+    session = Session()
 
     while True:
         logging.info("Showing menu")
@@ -21,9 +33,10 @@ def run_cli(api_key: str, app: TodoApp) -> None:
         # Natural-language command directly from the menu
         if not choice_raw.isdigit() or choice_raw not in {"1", "2", "3", "4", "5", "6"}:
             user_input = choice_raw
-            response = agent_executor.invoke({"input": user_input})
-            logging.info(f"AI-assisted command (direct) result: {response.get('output')}")
-            print(response.get("output"))
+            response = run_command(user_input, app, agent_executor, **session.prompt_inputs())
+            session.record(user_input, response.output, response.steps)
+            logging.info("Direct command result (%s): %s", response.handled_by, response.output)
+            print(response.output)
             continue
 
         choice = choice_raw
@@ -33,16 +46,15 @@ def run_cli(api_key: str, app: TodoApp) -> None:
                 title = input("Enter task title: ")
                 description = input("Enter task description: ")
                 due_date = input("Enter due date (YYYY-MM-DD): ")
-                result = agent_executor.invoke({
-                    "input": f"Add a task with title '{title}', description '{description}', due date {due_date}",
-                })
-                logging.info(f"Add task result: {result['output']}")
-                print(result["output"])
+                # Structured input: no need to ask the LLM to fill in a form we already have
+                output = add_task(app, title, description, due_date)
+                logging.info("Add task result: %s", output)
+                print(output)
 
             elif choice == "2":
-                result = agent_executor.invoke({"input": "Show all tasks"})
+                output = list_tasks(app)
                 logging.info("Show all tasks result:")
-                print(result["output"])
+                print(output)
 
             elif choice == "3":
                 task_id = int(input("Enter task ID to update: "))
@@ -51,24 +63,16 @@ def run_cli(api_key: str, app: TodoApp) -> None:
                 due_date = input("New due date (YYYY-MM-DD or blank): ") or None
                 completed_str = input("Mark as completed? (y/n or blank): ").lower()
                 completed = True if completed_str == 'y' else False if completed_str == 'n' else None
-                input_text = f"Update task {task_id}"
-                if title:
-                    input_text += f" with title '{title}'"
-                if description:
-                    input_text += f", description '{description}'"
-                if due_date:
-                    input_text += f", due date {due_date}"
-                if completed is not None:
-                    input_text += f", completed {completed}"
-                result = agent_executor.invoke({"input": input_text})
-                logging.info(f"Update task result: {result['output']}")
-                print(result["output"])
+                success = app.update_task(task_id, title, description, normalize_due_date(due_date), completed)
+                output = "Task updated successfully." if success else "Task not found or no changes made."
+                logging.info("Update task result: %s", output)
+                print(output)
 
             elif choice == "4":
                 task_id = int(input("Enter task ID to delete: "))
-                result = agent_executor.invoke({"input": f"Delete task {task_id}"})
-                logging.info(f"Delete task result: {result['output']}")
-                print(result["output"])
+                output = delete_task(app, task_id)
+                logging.info("Delete task result: %s", output)
+                print(output)
 
             elif choice == "5":
                 logging.info("User exited the app")
@@ -79,14 +83,17 @@ def run_cli(api_key: str, app: TodoApp) -> None:
             elif choice == "6":
                 user_input = input("Enter your task or command in natural language: ")
                 current_date = datetime.today().strftime("%Y-%m-%d")
-                response = agent_executor.invoke({"input": user_input, "current_date": current_date})
-                logging.info(f"AI-assisted command result: {response['output']}")
-                print(response["output"])
+                response = run_command(
+                    user_input, app, agent_executor, current_date=current_date, **session.prompt_inputs()
+                )
+                session.record(user_input, response.output, response.steps)
+                logging.info("AI-assisted command result (%s): %s", response.handled_by, response.output)
+                print(response.output)
 
             else:
-                logging.warning(f"Invalid user choice: {choice}")
+                logging.warning("Invalid user choice: %s", choice)
                 print("Invalid choice. Please try again.")
 
         except Exception as e:
-            logging.error(f"Exception in main loop: {e}", exc_info=True)
+            logging.error("Exception in main loop: %s", e, exc_info=True)
             print(f"Error: {e}")
\ No newline at end of file
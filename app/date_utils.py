@@ -1,84 +1,185 @@
-from datetime import date, datetime as _dt, timedelta
+from datetime import date, timedelta
+from functools import lru_cache
 import re
-from typing import Optional
+from typing import Iterable, List, Optional
 
 
-def normalize_due_date(due: Optional[str]) -> Optional[str]:
-    """Normalize natural-language dates to ISO YYYY-MM-DD.
-    Examples: '7th october' -> '2025-10-07', 'today'/'tomorrow', '07-10' -> current-year.
+_MONTHS = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+# Day 0 of the epoch-day numbering stored in tasks.due_day
+_EPOCH = date(1970, 1, 1).toordinal()
+_ISO_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+_WEEKDAYS = {
+    "mon": 0, "monday": 0,
+    "tue": 1, "tues": 1, "tuesday": 1,
+    "wed": 2, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4,
+    "sat": 5, "saturday": 5,
+    "sun": 6, "sunday": 6,
+}
+
+
+class DueDateParser:
+    """Natural-language due dates -> ISO YYYY-MM-DD, with patterns compiled once.
+
+    Handles 'today'/'tomorrow', '7th october [2025]', 'october 7 [2025]',
+    dd-mm[-yy|yyyy] (also / and .), ISO dates, weekday names ('friday',
+    'this friday', 'next friday') and offsets ('in 3 days', 'in 2 weeks',
+    'next week'). Results are memoized per (input, today).
     """
-    if not due:
+
+    _ORDINAL = re.compile(r"(\d{1,2})(st|nd|rd|th)\b")
+    _NUMERIC = re.compile(r"^(\d{1,2})[-/.](\d{1,2})(?:[-/.](\d{2,4}))?$")
+    _ISO = re.compile(r"^(\d{4})-(0[1-9]|1[0-2]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9])$")
+    _IN_OFFSET = re.compile(r"^in (\d{1,4}) (day|days|week|weeks)$")
+    _WEEKDAY = re.compile(r"^(?:(this|next|on) )?([a-z]+)$")
+
+    def __init__(self, cache_size: int = 4096):
+        self._cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def normalize(self, due: Optional[str], today: Optional[date] = None) -> Optional[str]:
+        """ISO date for `due`, or the original text when it can't be parsed."""
+        if not due:
+            return None
+        iso = self._cached(due, today or date.today())
+        return iso if iso is not None else due
+
+    def parse(self, due: Optional[str], today: Optional[date] = None) -> Optional[date]:
+        """Like `normalize`, but None instead of the raw text when parsing fails."""
+        if not due:
+            return None
+        iso = self._cached(due, today or date.today())
+        return date.fromisoformat(iso) if iso is not None else None
+
+    def normalize_many(self, values: Iterable[Optional[str]], today: Optional[date] = None) -> List[Optional[str]]:
+        """Batch form of `normalize` for bulk imports; 'today' is resolved once."""
+        today = today or date.today()
+        return [self.normalize(v, today) for v in values]
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def _parse(self, due: str, today: date) -> Optional[str]:
+        d = due.strip().lower().replace(",", "")
+
+        # Quick words
+        if d == "today":
+            return today.isoformat()
+        if d == "tomorrow":
+            return (today + timedelta(days=1)).isoformat()
+        if d == "day after tomorrow":
+            return (today + timedelta(days=2)).isoformat()
+        if d == "next week":
+            return (today + timedelta(days=7)).isoformat()
+
+        # Offsets: "in 3 days", "in 2 weeks"
+        m = self._IN_OFFSET.match(d)
+        if m:
+            n = int(m.group(1)) * (7 if m.group(2).startswith("week") else 1)
+            return (today + timedelta(days=n)).isoformat()
+
+        # Weekdays: "friday"/"this friday" is the next one on or after today,
+        # "next friday" the next one strictly after today
+        m = self._WEEKDAY.match(d)
+        if m and m.group(2) in _WEEKDAYS:
+            ahead = (_WEEKDAYS[m.group(2)] - today.weekday()) % 7
+            if ahead == 0 and m.group(1) == "next":
+                ahead = 7
+            return (today + timedelta(days=ahead)).isoformat()
+
+        # Remove ordinal suffixes: 1st, 2nd, 3rd, 4th...
+        d = self._ORDINAL.sub(r"\1", d)
+
+        # Patterns like "7 october [2025]" or "october 7 [2025]"
+        parts = d.split()
+        if len(parts) in (2, 3):
+            if parts[0].isdigit() and parts[1] in _MONTHS:
+                year = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else today.year
+                iso = self._safe_date(year, _MONTHS[parts[1]], int(parts[0]))
+                if iso:
+                    return iso
+            if parts[0] in _MONTHS and parts[1].isdigit():
+                year = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else today.year
+                iso = self._safe_date(year, _MONTHS[parts[0]], int(parts[1]))
+                if iso:
+                    return iso
+
+        # Numeric: dd-mm[-yy|yyyy], dd/mm[/yy|yyyy], dd.mm[.yy|yyyy]
+        m = self._NUMERIC.match(d)
+        if m:
+            day, month, y = m.groups()
+            if y is None:
+                year = today.year
+            else:
+                year = int(y)
+                if year < 100:
+                    year += 2000
+            iso = self._safe_date(year, int(month), int(day))
+            if iso:
+                return iso
+
+        # Already ISO
+        m = self._ISO.match(d)
+        if m:
+            return self._safe_date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
         return None
 
-    d = due.strip().lower().replace(",", "")
-    today = date.today()
-
-    # Quick words
-    if d == "today":
-        return today.isoformat()
-    if d == "tomorrow":
-        return (today + timedelta(days=1)).isoformat()
-
-    # Remove ordinal suffixes: 1st, 2nd, 3rd, 4th...
-    d = re.sub(r"(\d{1,2})(st|nd|rd|th)\b", r"\1", d)
-
-    months = {
-        "jan": 1, "january": 1,
-        "feb": 2, "february": 2,
-        "mar": 3, "march": 3,
-        "apr": 4, "april": 4,
-        "may": 5,
-        "jun": 6, "june": 6,
-        "jul": 7, "july": 7,
-        "aug": 8, "august": 8,
-        "sep": 9, "sept": 9, "september": 9,
-        "oct": 10, "october": 10,
-        "nov": 11, "november": 11,
-        "dec": 12, "december": 12,
-    }
-
-    # Patterns like "7 october [2025]" or "october 7 [2025]"
-    parts = d.split()
-    if len(parts) in (2, 3):
-        if parts[0].isdigit() and parts[1] in months:
-            day = int(parts[0])
-            month = months[parts[1]]
-            year = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else today.year
-            try:
-                return date(year, month, day).isoformat()
-            except ValueError:
-                pass
-        if parts[0] in months and parts[1].isdigit():
-            month = months[parts[0]]
-            day = int(parts[1])
-            year = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else today.year
-            try:
-                return date(year, month, day).isoformat()
-            except ValueError:
-                pass
-
-    # Numeric: dd-mm[-yy|yyyy], dd/mm[/yy|yyyy], dd.mm[.yy|yyyy]
-    m = re.match(r"^(\d{1,2})[-/.](\d{1,2})(?:[-/.](\d{2,4}))?$", d)
-    if m:
-        day, month, y = m.groups()
-        day = int(day)
-        month = int(month)
-        if y is None:
-            year = today.year
-        else:
-            year = int(y)
-            if year < 100:
-                year += 2000
+    @staticmethod
+    def _safe_date(year: int, month: int, day: int) -> Optional[str]:
         try:
             return date(year, month, day).isoformat()
-        except ValueError:
-            pass
+        except (ValueError, OverflowError):
+            return None
+
+
+_PARSER = DueDateParser()
+
+
+def normalize_due_date(due: Optional[str], today: Optional[date] = None) -> Optional[str]:
+    """Normalize natural-language dates to ISO YYYY-MM-DD.
+    Examples: '7th october' -> '2025-10-07', 'today'/'tomorrow', '07-10' -> current-year,
+    'next friday', 'in 3 days'. Unparseable text is returned unchanged.
+    """
+    return _PARSER.normalize(due, today)
 
-    # Already ISO
+
+def parse_due_date(due: Optional[str], today: Optional[date] = None) -> Optional[date]:
+    """`date` for `due`, or None if it isn't a recognisable date."""
+    return _PARSER.parse(due, today)
+
+
+def normalize_many(values: Iterable[Optional[str]], today: Optional[date] = None) -> List[Optional[str]]:
+    """Normalize a batch of due dates (e.g. for bulk imports)."""
+    return _PARSER.normalize_many(values, today)
+
+
+def epoch_day(due) -> Optional[int]:
+    """Days since 1970-01-01 for a date or an ISO due date (as in tasks.due_day), else None."""
+    if isinstance(due, date):
+        return due.toordinal() - _EPOCH
+    if not due or not _ISO_PREFIX.match(due):
+        return None
     try:
-        return _dt.strptime(d, "%Y-%m-%d").date().isoformat()
+        return date.fromisoformat(due[:10]).toordinal() - _EPOCH
     except ValueError:
-        pass
+        return None
+
 
-    # Fallback: keep original text
-    return due
\ No newline at end of file
+def from_epoch_day(day: int) -> date:
+    return date.fromordinal(day + _EPOCH)
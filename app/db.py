@@ -1,70 +1,640 @@
 # app/db.py
 import sqlite3
+import asyncio
 import logging
+import contextvars
+import random
 import threading
-from typing import List, Optional, Tuple
-from .models import Task
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .date_utils import epoch_day
+from .models import Task, TaskChange
+from .metrics import timed_db, DB_WRITE_RETRIES
 import re
+from contextlib import contextmanager
+from datetime import date
+
+# Columns in Task field order; the table also has bookkeeping columns
+_COLUMNS = "id, title, description, due_date, completed"
+_T_COLUMNS = "t.id, t.title, t.description, t.due_date, t.completed"
+# tasks.due_day: days since 1970-01-01 for ISO due dates, NULL for none or free text
+# (matches date_utils.epoch_day)
+_DUE_DAY = (
+    "CASE WHEN {0} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*' "
+    "THEN CAST(julianday(substr({0}, 1, 10)) - 2440587.5 AS INTEGER) END"
+)
+
+# Words ignored when comparing titles
+_STOPWORDS = {"to", "a", "the", "for", "and", "go"}
+# Extra filler dropped from full-text queries ("that dentist thing")
+_SEARCH_STOPWORDS = _STOPWORDS | {"that", "this", "my", "thing", "stuff", "of", "on", "in", "with", "about"}
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """True for lock contention ("database is locked", SQLITE_BUSY), which is worth retrying."""
+    name = getattr(error, "sqlite_errorname", "") or ""
+    return name.startswith(("SQLITE_BUSY", "SQLITE_LOCKED")) or "locked" in str(error) or "busy" in str(error)
+
+
+def _drop_stale_trigger(cur: sqlite3.Cursor, name: str, marker: str) -> None:
+    """Drop trigger `name` if its SQL lacks `marker`, so the CREATE TRIGGER IF NOT EXISTS after it installs the current one."""
+    cur.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+    row = cur.fetchone()
+    if row is not None and marker not in row[0]:
+        cur.execute(f"DROP TRIGGER {name}")
+
+
+# AFTER INSERT triggers skip rows inserted with a version: import_tasks stamps
+# those itself, a batch at a time
+_UNSTAMPED = "new.version = 0"
+
+
+def _execute_script(cur: sqlite3.Cursor, script: str) -> None:
+    """Run a multi-statement script inside the current transaction (executescript would commit it)."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            cur.execute(statement)
+            statement = ""
+
+
+class _CommitGroup:
+    """Writes sharing one commit in group-commit mode."""
+
+    def __init__(self) -> None:
+        self.done = False
+        self.error: Exception | None = None
+
 
 class TodoApp:
-    def __init__(self, db_name: str = "todo.db"):
-        logging.info(f"Initializing TodoApp with DB: {db_name}")
+    def __init__(
+        self,
+        db_name: str = "todo.db",
+        group_commit_ms: float = 0.0,
+        busy_timeout_ms: float = 5000.0,
+        write_retries: int = 5,
+    ):
+        logging.info("Initializing TodoApp with DB: %s", db_name)
+        self.db_name = db_name
+        # > 0: concurrent single writes arriving within this window share one commit
+        self.group_commit_ms = group_commit_ms
+        # Other processes may hold the database lock (several API workers on one
+        # file): SQLite waits up to busy_timeout_ms, then _write retries the
+        # whole transaction up to write_retries times.
+        self.busy_timeout_ms = busy_timeout_ms
+        self.write_retries = write_retries
         # One shared connection; no shared cursor
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
+        self.conn = sqlite3.connect(db_name, check_same_thread=False, timeout=busy_timeout_ms / 1000)
         # Suggested pragmas for better concurrency on SQLite
         self.conn.execute("PRAGMA journal_mode=WAL;")
         self.conn.execute("PRAGMA synchronous=NORMAL;")
         self._writelock = threading.Lock()
+        self._commit_cond = threading.Condition(self._writelock)
+        self._commit_group: _CommitGroup | None = None
+        # Cursor of the write_batch transaction running on this thread, if any
+        self._batch = threading.local()
         self.create_table()
 
+    def _reader(self) -> sqlite3.Connection:
+        """Connection used for read-only queries. Overridden by AsyncTodoApp."""
+        return self.conn
+
     def create_table(self) -> None:
         logging.debug("Creating tasks table if not exists.")
-        cur = self.conn.cursor()
-        try:
+        has_index = self._write(self._create_schema)
+        if not has_index:
+            # Existing database from before the token index: backfill it once
+            self.rebuild_token_index()
+        self.has_fts = self._create_search_index()
+        logging.info("Tasks table ready.")
+
+    def _create_schema(self, cur: sqlite3.Cursor) -> bool:
+        """Create or migrate tables and indexes. Runs in one write transaction, so
+        workers starting together take turns. Returns whether the token index existed."""
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                due_date TEXT,
+                completed BOOLEAN NOT NULL,
+                title_key TEXT,
+                version INTEGER NOT NULL DEFAULT 0,
+                due_day INTEGER
+            )
+            """
+        )
+        # data_version is bumped in every write transaction that changes tasks
+        cur.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        cur.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+        # Adds the version column the other tables' insert triggers check
+        self._migrate_row_versions(cur)
+        self._migrate_title_key(cur)
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_tokens'")
+        has_index = cur.fetchone() is not None
+        # Inverted index of title tokens used by find_task_by_title_fuzzy
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_tokens (
+                token TEXT NOT NULL,
+                task_id INTEGER NOT NULL,
+                PRIMARY KEY (token, task_id)
+            ) WITHOUT ROWID
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_task_tokens_task_id ON task_tokens(task_id)")
+        # Backs the list_tasks status filter; ends in id so keyset pages stay index-ordered
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed_id ON tasks(completed, id)")
+        self._migrate_due_day(cur)
+        return has_index
+
+    @staticmethod
+    def _migrate_row_versions(cur: sqlite3.Cursor) -> None:
+        """Per-row change versions and delete tombstones behind changes_since.
+
+        Triggers stamp every inserted or edited row with the next value of the
+        row_version counter and record deletes as tombstones, so all write paths
+        feed the change log without extra code (import_tasks stamps its rows in bulk).
+        """
+        cur.execute("PRAGMA table_info(tasks)")
+        if "version" not in {row[1] for row in cur.fetchall()}:
+            logging.info("Migrating tasks table: adding version")
+            cur.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            # Existing rows get distinct versions, so since=0 pages through them like any change
+            cur.execute("UPDATE tasks SET version = id")
+            cur.execute(
+                "INSERT OR IGNORE INTO meta (key, value) SELECT 'row_version', COALESCE(MAX(id), 0) FROM tasks"
+            )
+        cur.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('row_version', 0)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_version ON tasks(version)")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_tombstones (
+                task_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_task_tombstones_version ON task_tombstones(version)")
+        _drop_stale_trigger(cur, "tasks_version_ai", _UNSTAMPED)
+        _execute_script(
+            cur,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS tasks_version_ai AFTER INSERT ON tasks WHEN {_UNSTAMPED} BEGIN
+                UPDATE meta SET value = value + 1 WHERE key = 'row_version';
+                UPDATE tasks SET version = (SELECT value FROM meta WHERE key = 'row_version') WHERE id = new.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_version_au AFTER UPDATE OF title, description, due_date, completed ON tasks
+            BEGIN
+                UPDATE meta SET value = value + 1 WHERE key = 'row_version';
+                UPDATE tasks SET version = (SELECT value FROM meta WHERE key = 'row_version') WHERE id = new.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_version_ad AFTER DELETE ON tasks BEGIN
+                UPDATE meta SET value = value + 1 WHERE key = 'row_version';
+                INSERT OR REPLACE INTO task_tombstones (task_id, version)
+                VALUES (old.id, (SELECT value FROM meta WHERE key = 'row_version'));
+            END;
+            """,
+        )
+
+    @staticmethod
+    def _migrate_due_day(cur: sqlite3.Cursor) -> None:
+        """Due date as an integer epoch day, indexed for the overdue/upcoming queries.
+
+        due_date stays free text (the parser keeps what it can't read), so
+        range queries on it need the ISO filter and can't use an index well.
+        Triggers keep due_day in step with due_date on every write path.
+        """
+        cur.execute("PRAGMA table_info(tasks)")
+        if "due_day" not in {row[1] for row in cur.fetchall()}:
+            logging.info("Migrating tasks table: adding due_day")
+            cur.execute("ALTER TABLE tasks ADD COLUMN due_day INTEGER")
+            cur.execute(f"UPDATE tasks SET due_day = {_DUE_DAY.format('due_date')} WHERE due_date IS NOT NULL")
+        # Equality on completed, then a due_day range already in (due_day, id) order
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed_due_day ON tasks(completed, due_day)")
+        # A due range on its own (list_tasks without a status filter); rowid makes it (due_day, id)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_day ON tasks(due_day)")
+        # Superseded by the two above; due_date text is no longer range-filtered
+        cur.execute("DROP INDEX IF EXISTS idx_tasks_due_date_id")
+        _drop_stale_trigger(cur, "tasks_due_day_ai", _UNSTAMPED)
+        _execute_script(
+            cur,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS tasks_due_day_ai AFTER INSERT ON tasks
+            WHEN new.due_date IS NOT NULL AND {_UNSTAMPED} BEGIN
+                UPDATE tasks SET due_day = {_DUE_DAY.format('new.due_date')} WHERE id = new.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_due_day_au AFTER UPDATE OF due_date ON tasks BEGIN
+                UPDATE tasks SET due_day = {_DUE_DAY.format('new.due_date')} WHERE id = new.id;
+            END;
+            """,
+        )
+
+    @staticmethod
+    def _migrate_title_key(cur: sqlite3.Cursor) -> None:
+        """Normalized title (LOWER(TRIM(title))) backing exact-match lookups and upserts.
+
+        The UNIQUE index makes it an ON CONFLICT target. Titles may repeat, so
+        only the canonical (oldest) task per normalized title holds the key and
+        duplicates keep NULL; triggers hand the key on when it is renamed or
+        deleted.
+        """
+        cur.execute("PRAGMA table_info(tasks)")
+        if "title_key" not in {row[1] for row in cur.fetchall()}:
+            logging.info("Migrating tasks table: adding title_key")
+            cur.execute("ALTER TABLE tasks ADD COLUMN title_key TEXT")
             cur.execute(
                 """
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    due_date TEXT,
-                    completed BOOLEAN NOT NULL
-                )
+                UPDATE tasks SET title_key = LOWER(TRIM(title))
+                WHERE id IN (SELECT MIN(id) FROM tasks GROUP BY LOWER(TRIM(title)))
                 """
             )
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_title_key ON tasks(title_key)")
+        # Duplicates waiting to inherit a key; small, since most titles are unique
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_title_dups ON tasks(LOWER(TRIM(title))) WHERE title_key IS NULL"
+        )
+        _drop_stale_trigger(cur, "tasks_title_key_ai", _UNSTAMPED)
+        _execute_script(
+            cur,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS tasks_title_key_ai AFTER INSERT ON tasks
+            WHEN new.title_key IS NULL AND {_UNSTAMPED} BEGIN
+                UPDATE tasks SET title_key = LOWER(TRIM(new.title))
+                WHERE id = new.id
+                  AND NOT EXISTS (SELECT 1 FROM tasks WHERE title_key = LOWER(TRIM(new.title)));
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_title_key_au AFTER UPDATE OF title ON tasks
+            WHEN LOWER(TRIM(new.title)) IS NOT LOWER(TRIM(old.title)) BEGIN
+                UPDATE tasks SET title_key = NULL WHERE id = new.id;
+                UPDATE tasks SET title_key = LOWER(TRIM(new.title))
+                WHERE id = new.id
+                  AND NOT EXISTS (SELECT 1 FROM tasks WHERE title_key = LOWER(TRIM(new.title)));
+                UPDATE tasks SET title_key = old.title_key
+                WHERE old.title_key IS NOT NULL AND id = (
+                    SELECT MIN(id) FROM tasks WHERE title_key IS NULL AND LOWER(TRIM(title)) = old.title_key
+                );
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_title_key_ad AFTER DELETE ON tasks
+            WHEN old.title_key IS NOT NULL BEGIN
+                UPDATE tasks SET title_key = old.title_key
+                WHERE id = (
+                    SELECT MIN(id) FROM tasks WHERE title_key IS NULL AND LOWER(TRIM(title)) = old.title_key
+                );
+            END;
+            """
+        )
+
+    def _create_search_index(self) -> bool:
+        """FTS5 index over title/description, kept in sync by triggers.
+
+        Returns False when this SQLite build lacks FTS5; search_tasks then
+        falls back to LIKE matching.
+        """
+        try:
+            self._write(self._create_fts)
+            return True
+        except sqlite3.OperationalError as e:
+            logging.warning("Full-text search unavailable (%s); falling back to LIKE", e)
+            return False
+
+    @staticmethod
+    def _create_fts(cur: sqlite3.Cursor) -> None:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+        existed = cur.fetchone() is not None
+        cur.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                title, description, content='tasks', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+            """
+        )
+        _drop_stale_trigger(cur, "tasks_fts_ai", _UNSTAMPED)
+        _execute_script(
+            cur,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks WHEN {_UNSTAMPED} BEGIN
+                INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+            """
+        )
+        if not existed:
+            # Existing rows predate the index
+            cur.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+    def rebuild_search_index(self) -> None:
+        if not self.has_fts:
+            return
+        logging.info("Rebuilding full-text search index")
+        self._write(lambda cur: cur.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+
+    @timed_db
+    def rebuild_token_index(self) -> int:
+        """Rebuild the title token index from scratch. Returns the number of tasks indexed."""
+        logging.info("Rebuilding title token index")
+
+        def write(cur: sqlite3.Cursor) -> int:
+            cur.execute("DELETE FROM task_tokens")
+            cur.execute("SELECT id, title FROM tasks")
+            rows = cur.fetchall()
+            cur.executemany(
+                "INSERT INTO task_tokens (token, task_id) VALUES (?, ?)",
+                ((tok, task_id) for task_id, title in rows for tok in self._tokenize(title)),
+            )
+            return len(rows)
+
+        count = self._write(write)
+        logging.info("Indexed %s task(s)", count)
+        return count
+
+    def _commit(self) -> None:
+        """Commit pending writes. Caller holds the write lock.
+
+        In group-commit mode the first writer waits `group_commit_ms` (releasing
+        the lock) so that concurrent writers can join its transaction, then
+        commits once for all of them; the others block until that commit lands.
+        """
+        if self.group_commit_ms <= 0:
+            try:
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            return
+        group = self._commit_group
+        if group is not None:
+            self._wait_for(group)
+            return
+        group = self._commit_group = _CommitGroup()
+        try:
+            self._commit_cond.wait(self.group_commit_ms / 1000)
             self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            group.error = e
+            raise
+        finally:
+            group.done = True
+            self._commit_group = None
+            self._commit_cond.notify_all()
+
+    def _wait_for(self, group: _CommitGroup) -> None:
+        """Block until `group` is committed, re-raising its error. Caller holds the write lock."""
+        while not group.done:
+            self._commit_cond.wait()
+        if group.error is not None:
+            raise group.error
+
+    def write_batch(self, calls: Sequence[Callable[[], Any]]) -> List[Any]:
+        """Run `calls` one after another on this thread in a single write transaction.
+
+        Writes the calls make through this app join the transaction instead of
+        committing on their own. A call that raises has its own changes rolled
+        back and the exception returned in its slot; the rest still commit.
+        Calls may be rerun on lock contention, like any `_write` unit.
+        """
+        def write(cur: sqlite3.Cursor) -> List[Any]:
+            self._batch.cur = cur
+            try:
+                results = []
+                for call in calls:
+                    try:
+                        with self._atomic(cur):
+                            results.append(call())
+                    except sqlite3.OperationalError as e:
+                        if _is_busy(e):
+                            raise
+                        results.append(e)
+                    except Exception as e:
+                        results.append(e)
+                return results
+            finally:
+                self._batch.cur = None
+
+        return self._write(write)
+
+    @contextmanager
+    def _atomic(self, cur: sqlite3.Cursor):
+        """Run the enclosed statements as one unit. Caller holds the write lock and commits.
+
+        Opens the transaction with BEGIN IMMEDIATE so the write lock is taken
+        up front, and uses a savepoint so a failure never rolls back unrelated
+        writes pending in a commit group.
+        """
+        began = not self.conn.in_transaction
+        if began:
+            cur.execute("BEGIN IMMEDIATE")
+        cur.execute("SAVEPOINT atomic")
+        try:
+            yield
+        except BaseException:
+            cur.execute("ROLLBACK TO atomic")
+            cur.execute("RELEASE atomic")
+            if began:
+                self.conn.rollback()
+            raise
+        cur.execute("RELEASE atomic")
+
+    def _write(self, fn: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """Run `fn(cursor)` as one write transaction, commit it and return its result.
+
+        Lock contention from another process that outlasts the busy timeout
+        rolls the unit back and reruns it, up to `write_retries` times with
+        jittered exponential backoff, so `fn` must only touch the database.
+        """
+        cur = getattr(self._batch, "cur", None)
+        if cur is not None:
+            # Inside write_batch on this thread: its transaction and lock are ours
+            with self._atomic(cur):
+                return fn(cur)
+        for attempt in range(self.write_retries + 1):
+            with self._writelock:
+                cur = self.conn.cursor()
+                try:
+                    with self._atomic(cur):
+                        result = fn(cur)
+                    self._commit()
+                    return result
+                except sqlite3.OperationalError as e:
+                    if not _is_busy(e) or attempt == self.write_retries:
+                        raise
+                finally:
+                    cur.close()
+            DB_WRITE_RETRIES.inc()
+            delay = min(0.5, 0.01 * 2 ** attempt) * random.uniform(0.5, 1.0)
+            logging.warning("Database busy; retrying write in %.0f ms (attempt %s)", delay * 1000, attempt + 1)
+            # Sleep without the lock so this process's other writers are not held up
+            time.sleep(delay)
+
+    def _bump_version(self, cur: sqlite3.Cursor) -> None:
+        """Record that tasks changed. Caller holds the write lock and commits."""
+        cur.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+    @property
+    def data_version(self) -> int:
+        """Monotonic counter of committed task changes; survives restarts and is shared across processes."""
+        cur = self._reader().cursor()
+        try:
+            cur.execute("SELECT value FROM meta WHERE key = 'data_version'")
+            row = cur.fetchone()
         finally:
             cur.close()
-        logging.info("Tasks table ready.")
+        return row[0] if row else 0
+
+    @property
+    def row_version(self) -> int:
+        """Version of the latest task change; pass it to changes_since to get what follows."""
+        cur = self._reader().cursor()
+        try:
+            cur.execute("SELECT value FROM meta WHERE key = 'row_version'")
+            row = cur.fetchone()
+        finally:
+            cur.close()
+        return row[0] if row else 0
+
+    def _index_title(self, cur: sqlite3.Cursor, task_id: int, title: str | None) -> None:
+        """Replace the index entries for `task_id`. Caller holds the write lock and commits."""
+        cur.execute("DELETE FROM task_tokens WHERE task_id = ?", (task_id,))
+        if title is not None:
+            cur.executemany(
+                "INSERT INTO task_tokens (token, task_id) VALUES (?, ?)",
+                ((tok, task_id) for tok in self._tokenize(title)),
+            )
 
     # ---------------- Core CRUD ----------------
+    @timed_db
     def add_task(self, title: str, description: str | None, due_date: str | None) -> int:
-        logging.info(f"Adding task: title='{title}', due_date='{due_date}'")
-        with self._writelock:
-            cur = self.conn.cursor()
-            try:
-                cur.execute(
-                    "INSERT INTO tasks (title, description, due_date, completed) VALUES (?, ?, ?, ?)",
-                    (title, description, due_date, False),
-                )
-                self.conn.commit()
-                task_id = cur.lastrowid
-            finally:
-                cur.close()
-        logging.debug(f"Task added with ID {task_id}")
+        logging.info("Adding task: title='%s', due_date='%s'", title, due_date)
+
+        def write(cur: sqlite3.Cursor) -> int:
+            cur.execute(
+                "INSERT INTO tasks (title, description, due_date, completed) VALUES (?, ?, ?, ?)",
+                (title, description, due_date, False),
+            )
+            task_id = cur.lastrowid
+            self._index_title(cur, task_id, title)
+            self._bump_version(cur)
+            return task_id
+
+        task_id = self._write(write)
+        logging.debug("Task added with ID %s", task_id)
         return task_id
 
+    @timed_db
     def get_all_tasks(self) -> List[Task]:
         logging.info("Retrieving all tasks from DB")
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
+        try:
+            cur.execute(f"SELECT {_COLUMNS} FROM tasks")
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        logging.debug("Retrieved %s tasks", len(rows))
+        return [Task(*row) for row in rows]
+
+    @timed_db
+    def get_task(self, task_id: int) -> Optional[Task]:
+        cur = self._reader().cursor()
+        try:
+            cur.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (task_id,))
+            row = cur.fetchone()
+        finally:
+            cur.close()
+        return Task(*row) if row else None
+
+    @timed_db
+    def list_tasks(
+        self,
+        completed: bool | None = None,
+        due_from: str | None = None,
+        due_to: str | None = None,
+        after_id: int | None = None,
+        limit: int = 50,
+    ) -> List[Task]:
+        """Return up to `limit` tasks with id > `after_id`, ordered by id (keyset pagination).
+
+        `due_from`/`due_to` are inclusive ISO dates (ValueError otherwise); tasks
+        without a due date, or with free text instead of one, are excluded when
+        either bound is given.
+        """
+        clauses, values = [], []
+        if completed is not None:
+            clauses.append("completed = ?"); values.append(1 if completed else 0)
+        # due_day is NULL for free text, so those rows never match a bound
+        for name, bound, op in (("due_from", due_from, ">="), ("due_to", due_to, "<=")):
+            if bound is None:
+                continue
+            day = epoch_day(bound)
+            if day is None:
+                raise ValueError(f"{name} must be an ISO date such as 2025-10-07, got {bound!r}")
+            clauses.append(f"due_day {op} ?"); values.append(day)
+        if after_id is not None:
+            clauses.append("id > ?"); values.append(after_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        values.append(limit)
+        cur = self._reader().cursor()
         try:
-            cur.execute("SELECT * FROM tasks")
+            cur.execute(f"SELECT {_COLUMNS} FROM tasks {where} ORDER BY id LIMIT ?", values)
             rows = cur.fetchall()
         finally:
             cur.close()
-        logging.debug(f"Retrieved {len(rows)} tasks")
+        logging.debug("Listed %s task(s) after ID %s", len(rows), after_id)
         return [Task(*row) for row in rows]
 
+    def iter_tasks(self, chunk_size: int = 1000, completed: bool | None = None) -> Iterator[List[Task]]:
+        """Every task in id order, `chunk_size` at a time, for exports.
+
+        Each chunk is its own keyset query rather than one cursor held open for
+        the whole table, so a long export never pins a read snapshot (which
+        would stop WAL checkpoints) and memory stays at one chunk.
+        """
+        after_id = None
+        while True:
+            chunk = self.list_tasks(completed=completed, after_id=after_id, limit=chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1].id
+
+    @timed_db
+    def changes_since(self, since: int, limit: int = 500) -> List[TaskChange]:
+        """Task changes with version > `since`, oldest first: current rows for
+        inserts and edits, task=None for deletes. Only the latest change per task is kept."""
+        cur = self._reader().cursor()
+        try:
+            cur.execute(
+                """
+                SELECT version, id, title, description, due_date, completed FROM tasks WHERE version > ?
+                UNION ALL
+                SELECT version, task_id, NULL, NULL, NULL, NULL FROM task_tombstones WHERE version > ?
+                ORDER BY 1
+                LIMIT ?
+                """,
+                (since, since, limit),
+            )
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        return [
+            TaskChange(version, task_id, Task(task_id, *fields) if fields[0] is not None else None)
+            for version, task_id, *fields in rows
+        ]
+
+    @timed_db
     def update_task(
         self,
         task_id: int,
@@ -73,9 +643,38 @@ class TodoApp:
         due_date: str | None = None,
         completed: bool | None = None,
     ) -> bool:
-        logging.info(f"Updating task ID {task_id} with new values")
-        updates, values = [], []
+        logging.info("Updating task ID %s with new values", task_id)
+        updates, values = self._update_clause(title, description, due_date, completed)
+
+        if not updates:
+            logging.warning("No updates provided for task ID %s", task_id)
+            return False
 
+        values.append(task_id)
+        query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
+
+        def write(cur: sqlite3.Cursor) -> int:
+            logging.debug("Executing UPDATE: %s with %s", query, values)
+            cur.execute(query, values)
+            rowcount = cur.rowcount
+            if rowcount and title is not None:
+                self._index_title(cur, task_id, title)
+            if rowcount:
+                self._bump_version(cur)
+            return rowcount
+
+        rowcount = self._write(write)
+        logging.debug("Updated %s row(s)", rowcount)
+        return rowcount > 0
+
+    @staticmethod
+    def _update_clause(
+        title: str | None,
+        description: str | None,
+        due_date: str | None,
+        completed: bool | None,
+    ) -> Tuple[list[str], list]:
+        updates, values = [], []
         if title is not None:
             updates.append("title = ?"); values.append(title)
         if description is not None:
@@ -84,89 +683,332 @@ class TodoApp:
             updates.append("due_date = ?"); values.append(due_date)
         if completed is not None:
             updates.append("completed = ?"); values.append(1 if completed else 0)
+        return updates, values
 
-        if not updates:
-            logging.warning(f"No updates provided for task ID {task_id}")
-            return False
-
-        values.append(task_id)
-        query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
+    @timed_db
+    def delete_task(self, task_id: int) -> bool:
+        logging.info("Deleting task ID %s", task_id)
 
-        with self._writelock:
-            cur = self.conn.cursor()
-            try:
-                logging.debug(f"Executing UPDATE: {query} with {values}")
-                cur.execute(query, values)
-                self.conn.commit()
-                rowcount = cur.rowcount
-            finally:
-                cur.close()
-        logging.debug(f"Updated {rowcount} row(s)")
-        return rowcount > 0
+        def write(cur: sqlite3.Cursor) -> int:
+            cur.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            rowcount = cur.rowcount
+            self._index_title(cur, task_id, None)
+            if rowcount:
+                self._bump_version(cur)
+            return rowcount
 
-    def delete_task(self, task_id: int) -> bool:
-        logging.info(f"Deleting task ID {task_id}")
-        with self._writelock:
-            cur = self.conn.cursor()
-            try:
-                cur.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-                self.conn.commit()
-                rowcount = cur.rowcount
-            finally:
-                cur.close()
+        rowcount = self._write(write)
         if rowcount > 0:
-            logging.info(f"Task ID {task_id} deleted")
+            logging.info("Task ID %s deleted", task_id)
         else:
-            logging.warning(f"Task ID {task_id} not found to delete")
+            logging.warning("Task ID %s not found to delete", task_id)
         return rowcount > 0
 
+    # ---------------- Batch writes ----------------
+    # Each batch is one transaction: all rows land or none do.
+    @timed_db
+    def add_tasks(self, tasks: Iterable[Tuple[str, str | None, str | None]]) -> List[int]:
+        """Insert (title, description, due_date) rows in one transaction. Returns new IDs in order."""
+        tasks = list(tasks)
+        logging.info("Adding %s task(s) in one batch", len(tasks))
+
+        def write(cur: sqlite3.Cursor) -> List[int]:
+            # One execute per row for lastrowid; still a single commit
+            task_ids = []
+            for title, description, due_date in tasks:
+                cur.execute(
+                    "INSERT INTO tasks (title, description, due_date, completed) VALUES (?, ?, ?, ?)",
+                    (title, description, due_date, False),
+                )
+                task_ids.append(cur.lastrowid)
+            cur.executemany(
+                "INSERT INTO task_tokens (token, task_id) VALUES (?, ?)",
+                (
+                    (tok, task_id)
+                    for task_id, (title, _, _) in zip(task_ids, tasks)
+                    for tok in self._tokenize(title)
+                ),
+            )
+            if task_ids:
+                self._bump_version(cur)
+            return task_ids
+
+        task_ids = self._write(write)
+        logging.debug("Batch added %s task(s)", len(task_ids))
+        return task_ids
+
+    @timed_db
+    def update_tasks(
+        self,
+        task_ids: Iterable[int],
+        title: str | None = None,
+        description: str | None = None,
+        due_date: str | None = None,
+        completed: bool | None = None,
+    ) -> int:
+        """Apply the same field changes to every task in `task_ids`. Returns the number updated."""
+        task_ids = list(task_ids)
+        updates, values = self._update_clause(title, description, due_date, completed)
+        if not updates or not task_ids:
+            logging.warning("No updates or task IDs provided for batch update")
+            return 0
+        query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
+        logging.info("Updating %s task(s) in one batch", len(task_ids))
+
+        def write(cur: sqlite3.Cursor) -> int:
+            cur.executemany(query, ([*values, task_id] for task_id in task_ids))
+            rowcount = cur.rowcount
+            if title is not None:
+                tokens = self._tokenize(title)
+                cur.executemany("DELETE FROM task_tokens WHERE task_id = ?", ((i,) for i in task_ids))
+                cur.executemany(
+                    "INSERT INTO task_tokens (token, task_id) SELECT ?, id FROM tasks WHERE id = ?",
+                    ((tok, i) for i in task_ids for tok in tokens),
+                )
+            if rowcount:
+                self._bump_version(cur)
+            return rowcount
+
+        rowcount = self._write(write)
+        logging.debug("Batch updated %s row(s)", rowcount)
+        return rowcount
+
+    @timed_db
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        """Delete every task in `task_ids` in one transaction. Returns the number deleted."""
+        params = [(task_id,) for task_id in task_ids]
+        logging.info("Deleting %s task(s) in one batch", len(params))
+
+        def write(cur: sqlite3.Cursor) -> int:
+            cur.executemany("DELETE FROM tasks WHERE id = ?", params)
+            rowcount = cur.rowcount
+            cur.executemany("DELETE FROM task_tokens WHERE task_id = ?", params)
+            if rowcount:
+                self._bump_version(cur)
+            return rowcount
+
+        rowcount = self._write(write)
+        logging.debug("Batch deleted %s row(s)", rowcount)
+        return rowcount
+
+    @timed_db
+    def import_tasks(self, rows: Sequence[Tuple[str, str | None, str | None, bool]]) -> int:
+        """Insert (title, description, due_date, completed) rows in one transaction. Returns the count.
+
+        For bulk imports: ids are not returned, so the rows go in with a single
+        executemany. Each row is inserted already stamped (version, due_day,
+        title_key), so the per-row insert triggers skip it; the title tokens,
+        full-text index and row_version counter are updated once for the batch.
+        """
+        def write(cur: sqlite3.Cursor) -> int:
+            # The write transaction is exclusive, so every id and version above these is ours
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM tasks")
+            (last_id,) = cur.fetchone()
+            cur.execute("SELECT value FROM meta WHERE key = 'row_version'")
+            (version,) = cur.fetchone()
+            cur.executemany(
+                f"""
+                INSERT INTO tasks (title, description, due_date, completed, version, due_day, title_key)
+                VALUES (?1, ?2, ?3, ?4, ?5, {_DUE_DAY.format('?3')},
+                        CASE WHEN NOT EXISTS (SELECT 1 FROM tasks WHERE title_key = LOWER(TRIM(?1)))
+                        THEN LOWER(TRIM(?1)) END)
+                """,
+                (
+                    (title, description, due_date, bool(completed), version + n)
+                    for n, (title, description, due_date, completed) in enumerate(rows, 1)
+                ),
+            )
+            cur.execute("SELECT id, title FROM tasks WHERE id > ?", (last_id,))
+            added = cur.fetchall()
+            if not added:
+                return 0
+            cur.executemany(
+                "INSERT INTO task_tokens (token, task_id) VALUES (?, ?)",
+                ((tok, task_id) for task_id, title in added for tok in self._tokenize(title)),
+            )
+            if self.has_fts:
+                cur.execute(
+                    "INSERT INTO tasks_fts(rowid, title, description) SELECT id, title, description FROM tasks WHERE id > ?",
+                    (last_id,),
+                )
+            cur.execute("UPDATE meta SET value = value + ? WHERE key = 'row_version'", (len(added),))
+            self._bump_version(cur)
+            return len(added)
+
+        count = self._write(write)
+        logging.debug("Imported %s task(s)", count)
+        return count
+
     def close(self) -> None:
         logging.info("Closing database connection")
         self.conn.close()
 
+    # ---------------- Search ----------------
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Free text -> FTS5 query: OR of prefix-matched terms, so BM25 ranks partial matches."""
+        terms = [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in _SEARCH_STOPWORDS]
+        return " OR ".join(f'"{t}"*' for t in terms)
+
+    @timed_db
+    def search_tasks(self, query: str, limit: int = 10, completed: bool | None = None) -> List[Task]:
+        """Tasks matching `query` in title or description, best first (BM25, title weighted 2x)."""
+        match = self._fts_query(query)
+        if not match:
+            return []
+        status = "" if completed is None else f"AND t.completed = {1 if completed else 0}"
+        cur = self._reader().cursor()
+        try:
+            if self.has_fts:
+                cur.execute(
+                    f"""
+                    SELECT {_T_COLUMNS} FROM tasks_fts f JOIN tasks t ON t.id = f.rowid
+                    WHERE tasks_fts MATCH ? {status}
+                    ORDER BY bm25(tasks_fts, 2.0, 1.0)
+                    LIMIT ?
+                    """,
+                    (match, limit),
+                )
+            else:
+                like = f"%{query.strip()}%"
+                cur.execute(
+                    f"SELECT {_COLUMNS} FROM tasks t WHERE (title LIKE ? OR description LIKE ?) {status} "
+                    "ORDER BY id LIMIT ?",
+                    (like, like, limit),
+                )
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        logging.debug("Search '%s' matched %s task(s)", query, len(rows))
+        return [Task(*row) for row in rows]
+
+    # ---------------- Aggregates ----------------
+    # Due-date queries go through the indexed due_day column; tasks whose
+    # due date isn't an ISO date have no due_day and are left out.
+    @timed_db
+    def task_counts(self, today: str, week_end: str) -> dict:
+        """Counts by status plus open tasks overdue (before `today`) and due from `today` to `week_end`."""
+        cur = self._reader().cursor()
+        try:
+            cur.execute("SELECT COUNT(*), COALESCE(SUM(completed = 1), 0) FROM tasks")
+            total, done = cur.fetchone()
+            cur.execute(
+                """
+                SELECT COALESCE(SUM(due_day < ?), 0), COALESCE(SUM(due_day >= ?), 0)
+                FROM tasks WHERE completed = 0 AND due_day <= ?
+                """,
+                (epoch_day(today), epoch_day(today), epoch_day(week_end)),
+            )
+            overdue, due_week = cur.fetchone()
+        finally:
+            cur.close()
+        return {
+            "total": total,
+            "open": total - done,
+            "completed": done,
+            "overdue": overdue,
+            "due_this_week": due_week,
+        }
+
+    def _tasks_by_due_day(
+        self, first: int | None, last: int | None, completed: bool | None, limit: int
+    ) -> List[Task]:
+        """Tasks with first <= due_day <= last (either bound optional), soonest first."""
+        clauses, values = ["due_day IS NOT NULL"], []
+        if completed is not None:
+            clauses.append("completed = ?"); values.append(1 if completed else 0)
+        else:
+            # Keeps the (completed, due_day) index usable
+            clauses.append("completed IN (0, 1)")
+        if first is not None:
+            clauses.append("due_day >= ?"); values.append(first)
+        if last is not None:
+            clauses.append("due_day <= ?"); values.append(last)
+        values.append(limit)
+        cur = self._reader().cursor()
+        try:
+            cur.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE {' AND '.join(clauses)} ORDER BY due_day, id LIMIT ?",
+                values,
+            )
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        return [Task(*row) for row in rows]
+
+    @timed_db
+    def overdue_tasks(self, today: str | None = None, limit: int = 50) -> List[Task]:
+        """Open tasks due before `today` (default: the local date), most overdue first."""
+        return self._tasks_by_due_day(None, epoch_day(today or date.today()) - 1, False, limit)
+
+    @timed_db
+    def tasks_due_between(self, start: str, end: str, completed: bool | None = False, limit: int = 50) -> List[Task]:
+        """Tasks due from `start` to `end` (inclusive ISO dates), soonest first. Open tasks only by default."""
+        return self._tasks_by_due_day(epoch_day(start), epoch_day(end), completed, limit)
+
+    @timed_db
+    def next_due_tasks(self, n: int = 10, today: str | None = None) -> List[Task]:
+        """The next `n` open tasks due on or after `today` (default: the local date)."""
+        return self._tasks_by_due_day(epoch_day(today or date.today()), None, False, n)
+
     # ---------------- Matching / Idempotency ----------------
     @staticmethod
     def _tokenize(text: str) -> set[str]:
         tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
-        stop = {"to", "a", "the", "for", "and", "go"}
-        return {t for t in tokens if t not in stop}
+        return {t for t in tokens if t not in _STOPWORDS}
 
+    @timed_db
     def find_task_by_title(self, title: str) -> Optional[Task]:
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         try:
-            cur.execute(
-                "SELECT * FROM tasks WHERE LOWER(TRIM(title)) = LOWER(TRIM(?)) LIMIT 1",
-                (title,),
-            )
+            cur.execute(f"SELECT {_COLUMNS} FROM tasks WHERE title_key = LOWER(TRIM(?))", (title,))
             row = cur.fetchone()
         finally:
             cur.close()
         return Task(*row) if row else None
 
+    @timed_db
     def find_task_by_title_fuzzy(self, title: str, threshold: float = 0.5) -> Optional[Task]:
-        target = self._tokenize(title)
-        if not target:
-            return None
-        cur = self.conn.cursor()
+        cur = self._reader().cursor()
         try:
-            cur.execute("SELECT * FROM tasks")
-            rows = cur.fetchall()
+            row = self._fuzzy_row(cur, title, threshold)
         finally:
             cur.close()
-        best_row, best_score = None, 0.0
-        for row in rows:
-            t = self._tokenize(row[1])  # title
-            union = target | t
-            if not union:
-                continue
-            score = len(target & t) / len(union)
+        return Task(*row) if row else None
+
+    def _fuzzy_row(self, cur: sqlite3.Cursor, title: str, threshold: float) -> Optional[tuple]:
+        target = self._tokenize(title)
+        if not target:
+            return None
+        # Only tasks sharing at least one token can score above zero, so the
+        # candidates come straight from the token index. Jaccard = hits / (|target| + |title| - hits).
+        placeholders = ", ".join("?" for _ in target)
+        cur.execute(
+            f"""
+            SELECT m.task_id, m.hits,
+                   (SELECT COUNT(*) FROM task_tokens x WHERE x.task_id = m.task_id) AS n
+            FROM (
+                SELECT task_id, COUNT(*) AS hits FROM task_tokens
+                WHERE token IN ({placeholders}) GROUP BY task_id
+            ) m
+            ORDER BY m.task_id
+            """,
+            tuple(target),
+        )
+        best_id, best_score = None, 0.0
+        for task_id, hits, n in cur.fetchall():
+            score = hits / (len(target) + n - hits)
             if score > best_score:
-                best_score, best_row = score, row
-        if best_row and best_score >= threshold:
-            logging.debug(f"Fuzzy match {best_score:.2f} for '{title}' -> '{best_row[1]}' (ID {best_row[0]})")
-            return Task(*best_row)
-        return None
+                best_score, best_id = score, task_id
+        if best_id is None or best_score < threshold:
+            return None
+        cur.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (best_id,))
+        row = cur.fetchone()
+        if row:
+            logging.debug("Fuzzy match %.2f for '%s' -> '%s' (ID %s)", best_score, title, row[1], row[0])
+        return row
 
+    @timed_db
     def upsert_task(
         self,
         title: str,
@@ -175,21 +1017,175 @@ class TodoApp:
         completed: bool | None = None,
         use_fuzzy: bool = True,
     ) -> Tuple[int, bool, Task | None]:
-        existing = self.find_task_by_title(title)
-        if use_fuzzy and not existing:
-            existing = self.find_task_by_title_fuzzy(title)
-
-        if existing:
-            new_desc = description if description is not None else existing.description
-            new_due = due_date if due_date is not None else existing.due_date
-            new_completed = existing.completed if completed is None else (1 if completed else 0)
-            self.update_task(
-                existing.id,
-                description=new_desc,
-                due_date=new_due,
-                completed=bool(new_completed),
-            )
-            return existing.id, True, existing
+        """Update the task with this title (exact, then fuzzy) or insert a new one, atomically.
+
+        Returns (task_id, updated, task as it was before the update).
+        """
+        done = None if completed is None else (1 if completed else 0)
+
+        def write(cur: sqlite3.Cursor) -> Tuple[int, tuple | None]:
+            cur.execute(f"SELECT {_COLUMNS} FROM tasks WHERE title_key = LOWER(TRIM(?))", (title,))
+            existing = cur.fetchone()
+            if existing is None and use_fuzzy:
+                existing = self._fuzzy_row(cur, title, 0.5)
+            if existing is not None:
+                # Found through the title_key index or fuzzily: update it by id. An
+                # INSERT ... ON CONFLICT here would burn an AUTOINCREMENT id per call
+                cur.execute(
+                    """
+                    UPDATE tasks SET description = COALESCE(?, description),
+                                     due_date = COALESCE(?, due_date),
+                                     completed = COALESCE(?, completed)
+                    WHERE id = ?
+                    """,
+                    (description, due_date, done, existing[0]),
+                )
+                task_id = existing[0]
+            else:
+                # ON CONFLICT guards against a task with this title appearing since the lookup
+                cur.execute(
+                    """
+                    INSERT INTO tasks (title, description, due_date, completed, title_key)
+                    VALUES (?, ?, ?, COALESCE(?, 0), LOWER(TRIM(?)))
+                    ON CONFLICT(title_key) DO UPDATE SET
+                        description = COALESCE(excluded.description, description),
+                        due_date = COALESCE(excluded.due_date, due_date),
+                        completed = COALESCE(?, completed)
+                    RETURNING id
+                    """,
+                    (title, description, due_date, done, title, done),
+                )
+                task_id = cur.fetchone()[0]
+                self._index_title(cur, task_id, title)
+            self._bump_version(cur)
+            return task_id, existing
+
+        task_id, existing = self._write(write)
+        if existing is not None:
+            logging.debug("Upsert updated task ID %s", task_id)
+            return task_id, True, Task(*existing)
+        logging.debug("Upsert added task ID %s", task_id)
+        return task_id, False, None
+
+
+class AsyncTodoApp(TodoApp):
+    """`TodoApp` with pooled readers and a dedicated writer, for the async service.
+
+    Every thread other than the writer reads through its own read-only
+    connection, so under WAL readers never wait on a commit in progress.
+    Writes are funnelled through a dedicated writer executor (one thread, a
+    few in group-commit mode) that owns the shared connection. The `a*`
+    coroutines never block the event loop. An in-memory database cannot be
+    shared between connections, so ":memory:" falls back to the shared
+    connection for reads.
+
+    Several worker processes can serve one database file (`main.py serve
+    --workers N`): reads scale with the processes, and SQLite's file lock
+    orders their writes, which `_write` waits out and retries.
+    """
+
+    def __init__(self, db_name: str = "todo.db", readers: int = 4, group_commit_ms: float = 0.0, **kwargs: Any):
+        super().__init__(db_name, group_commit_ms=group_commit_ms, **kwargs)
+        self._local = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+        self._read_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="todo-read")
+        # Group commit needs several writes in flight to have anything to coalesce
+        writers = 8 if group_commit_ms > 0 else 1
+        self._write_pool = ThreadPoolExecutor(max_workers=writers, thread_name_prefix="todo-write")
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if self.db_name == ":memory:" or threading.current_thread().name.startswith("todo-write"):
+            return self.conn
+        uri = Path(self.db_name).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=self.busy_timeout_ms / 1000)
+        with self._reader_lock:
+            self._reader_conns.append(conn)
+        self._local.conn = conn
+        logging.debug("Opened reader connection for thread %s", threading.current_thread().name)
+        return conn
+
+    # ---------------- Executors ----------------
+    async def run_read(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        # Carry context (e.g. the request id used in logs) onto the pool thread
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._read_pool, lambda: ctx.run(fn, *args, **kwargs))
+
+    async def run_write(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._write_pool, lambda: ctx.run(fn, *args, **kwargs))
+
+    # ---------------- Async API ----------------
+    async def aget_all_tasks(self) -> List[Task]:
+        return await self.run_read(self.get_all_tasks)
+
+    async def aget_task(self, task_id: int) -> Optional[Task]:
+        return await self.run_read(self.get_task, task_id)
+
+    async def alist_tasks(self, **filters: Any) -> List[Task]:
+        return await self.run_read(self.list_tasks, **filters)
+
+    async def asearch_tasks(self, query: str, limit: int = 10, completed: bool | None = None) -> List[Task]:
+        return await self.run_read(self.search_tasks, query, limit, completed)
 
-        new_id = self.add_task(title, description, due_date)
-        return new_id, False, None
+    async def aiter_tasks(self, chunk_size: int = 1000, completed: bool | None = None) -> AsyncIterator[List[Task]]:
+        after_id = None
+        while True:
+            chunk = await self.alist_tasks(completed=completed, after_id=after_id, limit=chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1].id
+
+    async def aoverdue_tasks(self, today: str | None = None, limit: int = 50) -> List[Task]:
+        return await self.run_read(self.overdue_tasks, today, limit)
+
+    async def atasks_due_between(self, start: str, end: str, **kwargs: Any) -> List[Task]:
+        return await self.run_read(self.tasks_due_between, start, end, **kwargs)
+
+    async def anext_due_tasks(self, n: int = 10, today: str | None = None) -> List[Task]:
+        return await self.run_read(self.next_due_tasks, n, today)
+
+    async def achanges_since(self, since: int, limit: int = 500) -> List[TaskChange]:
+        return await self.run_read(self.changes_since, since, limit)
+
+    async def arow_version(self) -> int:
+        return await self.run_read(lambda: self.row_version)
+
+    async def afind_task_by_title_fuzzy(self, title: str, threshold: float = 0.5) -> Optional[Task]:
+        return await self.run_read(self.find_task_by_title_fuzzy, title, threshold)
+
+    async def aadd_task(self, title: str, description: str | None, due_date: str | None) -> int:
+        return await self.run_write(self.add_task, title, description, due_date)
+
+    async def aupdate_task(self, task_id: int, **fields: Any) -> bool:
+        return await self.run_write(self.update_task, task_id, **fields)
+
+    async def adelete_task(self, task_id: int) -> bool:
+        return await self.run_write(self.delete_task, task_id)
+
+    async def aadd_tasks(self, tasks: Iterable[Tuple[str, str | None, str | None]]) -> List[int]:
+        return await self.run_write(self.add_tasks, list(tasks))
+
+    async def aupdate_tasks(self, task_ids: Iterable[int], **fields: Any) -> int:
+        return await self.run_write(self.update_tasks, list(task_ids), **fields)
+
+    async def adelete_tasks(self, task_ids: Iterable[int]) -> int:
+        return await self.run_write(self.delete_tasks, list(task_ids))
+
+    async def aupsert_task(self, title: str, description: str | None, due_date: str | None, **kwargs: Any):
+        return await self.run_write(self.upsert_task, title, description, due_date, **kwargs)
+
+    def close(self) -> None:
+        self._write_pool.shutdown(wait=True)
+        self._read_pool.shutdown(wait=True)
+        with self._reader_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+        super().close()
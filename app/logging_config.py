@@ -1,8 +1,86 @@
+import os
+import sys
+import json
+import queue
+import atexit
 import logging
+import logging.handlers
+from contextvars import ContextVar
+from typing import Optional
 
-def configure_logging(level: int = logging.DEBUG) -> None:
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()],
-    )   
\ No newline at end of file
+# Set per HTTP request by the API middleware; "-" outside a request
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_TEXT_FORMAT = "%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s"
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id. Runs on the caller's thread, where the context lives."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves %-formatting to the listener thread.
+
+    The stock `prepare` renders the message on the caller's thread; here the
+    record is enqueued as-is, so callers pay only for building the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(level: int | str | None = None, json_output: bool | None = None) -> None:
+    """Route all logging through a queue drained by a background thread.
+
+    `level` defaults to $LOG_LEVEL (INFO if unset); `json_output` to
+    $LOG_FORMAT == "json". Safe to call more than once.
+    """
+    if level is None:
+        level = os.getenv("LOG_LEVEL", "INFO").upper()
+    if json_output is None:
+        json_output = os.getenv("LOG_FORMAT", "text").lower() == "json"
+
+    _stop_listener()
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if json_output else logging.Formatter(_TEXT_FORMAT))
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(q)
+    handler.addFilter(_RequestIdFilter())
+
+    root = logging.getLogger()
+    for h in root.handlers[:]:
+        root.removeHandler(h)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    global _listener
+    _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
@@ -0,0 +1,163 @@
+# app/metrics.py
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+No client library or external service: metrics are plain objects guarded by a
+lock, and `render()` produces the body for GET /metrics.
+"""
+import functools
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ITERATION_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for labels, state in sorted(self._values.items()):
+                cumulative = 0.0
+                for bound, count in zip((*self.buckets, math.inf), state):
+                    cumulative += count
+                    le = 'le="%s"' % _fmt(bound)
+                    lines.append(f"{self.name}_bucket{self._labels(labels, le)} {_fmt(cumulative)}")
+                lines.append(f"{self.name}_sum{self._labels(labels)} {_fmt(state[-1])}")
+                lines.append(f"{self.name}_count{self._labels(labels)} {_fmt(cumulative)}")
+        return lines
+
+
+# ---------------- Registry ----------------
+DB_SECONDS = Histogram("todo_db_call_seconds", "Latency of TodoApp methods.", ["method"])
+TOOL_SECONDS = Histogram("todo_tool_call_seconds", "Latency of agent tool calls.", ["tool"])
+LLM_SECONDS = Histogram("todo_llm_call_seconds", "Latency of chat model calls.", ["model"])
+AGENT_SECONDS = Histogram("todo_agent_run_seconds", "Latency of a full agent run.")
+AGENT_TOOL_ITERATIONS = Histogram(
+    "todo_agent_tool_iterations", "Tool calls made per agent run.", buckets=ITERATION_BUCKETS
+)
+AGENT_TOKENS = Histogram("todo_agent_tokens", "LLM tokens used per agent run.", ["kind"], buckets=TOKEN_BUCKETS)
+ERRORS = Counter("todo_errors_total", "Errors by component and name.", ["component", "name"])
+IN_FLIGHT = Gauge("todo_in_flight", "Operations currently running, by component.", ["component"])
+ROUTED = Counter("todo_commands_total", "Commands by the path that handled them.", ["handled_by"])
+DB_WRITE_RETRIES = Counter("todo_db_write_retries_total", "Write transactions retried after lock contention.")
+REMINDERS = Counter("todo_reminders_total", "Due-date reminders raised.")
+AGENT_REJECTED = Counter("todo_agent_rejected_total", "Agent requests turned away, by reason.", ["reason"])
+AGENT_SHARED = Counter("todo_agent_shared_total", "Agent requests answered by an identical run already in flight.")
+
+REGISTRY = [
+    DB_SECONDS, TOOL_SECONDS, LLM_SECONDS, AGENT_SECONDS, AGENT_TOOL_ITERATIONS,
+    AGENT_TOKENS, ERRORS, IN_FLIGHT, ROUTED, DB_WRITE_RETRIES, REMINDERS,
+    AGENT_REJECTED, AGENT_SHARED,
+]
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def timed_db(fn: Callable) -> Callable:
+    """Record latency, errors and in-flight count of a TodoApp method under its name."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        IN_FLIGHT.inc("db")
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            ERRORS.inc("db", name)
+            raise
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - start, name)
+            IN_FLIGHT.dec("db")
+
+    return wrapper
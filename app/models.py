@@ -15,4 +15,11 @@ class Task:
         due = self.due_date if self.due_date else "—"
         desc = f" — {self.description}" if self.description else ""
         return f"[{status}] {self.id}. {self.title} (Due: {due}){desc}"
-    
+
+
+@dataclass
+class TaskChange:
+    """One entry of the change feed: the task as of `version`, or None if it was deleted."""
+    version: int
+    task_id: int
+    task: Optional[Task] = None
@@ -0,0 +1,200 @@
+# app/reminders.py
+import asyncio
+import heapq
+import inspect
+import logging
+import time
+from datetime import date, datetime, time as clock, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .changes import ChangeFeed
+from .date_utils import epoch_day, from_epoch_day
+from .db import AsyncTodoApp
+from .models import Task, TaskChange
+from . import metrics
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows); run a single worker when reminders are on
+    fcntl = None
+
+
+def log_reminder(task: Task) -> None:
+    logging.info("Reminder: task %s '%s' is due %s", task.id, task.title, task.due_date)
+
+
+class LeaderLock:
+    """Non-blocking exclusive lock on a file, so one of several worker processes runs a job.
+
+    The OS drops the lock when its holder exits, so another worker can take over.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        f = open(self.path, "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                return False
+        self._file = f
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReminderScheduler:
+    """Raises a notification when an open task comes due, without scanning the table.
+
+    Tasks due within the next `horizon_days` sit in a min-heap keyed by when
+    their reminder fires (`remind_at` local time on the due day). The loop
+    sleeps until the earliest one, or until the change feed reports edits,
+    which reschedule the tasks they touch. The window is reloaded with one
+    indexed due_day range query each midnight.
+
+    With a `lock`, only the process holding it runs the loop; the others poll
+    every `lock_retry` seconds and take over if the holder exits.
+    """
+
+    def __init__(
+        self,
+        db: AsyncTodoApp,
+        feed: ChangeFeed,
+        notify: Callable[[Task], Any] = log_reminder,
+        remind_at: clock = clock(9, 0),
+        horizon_days: int = 7,
+        max_pending: int = 10000,
+        lock: Optional[LeaderLock] = None,
+        lock_retry: float = 30.0,
+    ):
+        self.db = db
+        self.feed = feed
+        self.notify = notify
+        self.remind_at = remind_at
+        self.horizon_days = horizon_days
+        self.max_pending = max_pending
+        self.lock = lock
+        self.lock_retry = lock_retry
+        # (fire_at, seq, task_id); entries whose seq no longer matches are stale
+        self._heap: List[Tuple[float, int, int]] = []
+        # task_id -> (seq, task) for every task scheduled in the window, fired or not
+        self._scheduled: Dict[int, Tuple[int, Task]] = {}
+        self._seq = 0
+        self._fired_until = 0.0
+        self._window: Tuple[int, int] = (0, -1)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self.lock is not None:
+            self.lock.release()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _fire_at(self, day: int) -> float:
+        return datetime.combine(from_epoch_day(day), self.remind_at).timestamp()
+
+    def _schedule(self, task: Task, day: int) -> None:
+        self._seq += 1
+        self._scheduled[task.id] = (self._seq, task)
+        heapq.heappush(self._heap, (self._fire_at(day), self._seq, task.id))
+
+    async def _reload(self) -> None:
+        today = epoch_day(date.today())
+        self._window = (today, today + self.horizon_days)
+        start, end = (from_epoch_day(d).isoformat() for d in self._window)
+        tasks = await self.db.atasks_due_between(start, end, limit=self.max_pending)
+        if len(tasks) == self.max_pending:
+            logging.warning("Reminder window holds more than %s tasks; later ones are skipped", self.max_pending)
+        self._heap.clear()
+        self._scheduled.clear()
+        for task in tasks:
+            day = epoch_day(task.due_date)
+            # Reminders that already went off (or before we started) stay quiet
+            if self._fire_at(day) > self._fired_until:
+                self._schedule(task, day)
+        logging.debug("Reminder window %s..%s: %s pending", start, end, len(self._heap))
+
+    def _apply(self, changes: Iterable[TaskChange]) -> None:
+        first, last = self._window
+        for change in changes:
+            task = change.task
+            day = epoch_day(task.due_date) if task is not None and not task.completed else None
+            if day is None or not first <= day <= last:
+                self._scheduled.pop(change.task_id, None)
+                continue
+            current = self._scheduled.get(task.id)
+            if current is not None and epoch_day(current[1].due_date) == day:
+                # Same due day (e.g. a renamed task): keep the entry, fired or not
+                self._scheduled[task.id] = (current[0], task)
+                continue
+            # A task newly due today after remind_at fires straight away
+            self._schedule(task, day)
+
+    async def _fire_due(self) -> None:
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, task_id = heapq.heappop(self._heap)
+            current = self._scheduled.get(task_id)
+            if current is None or current[0] != seq:
+                continue
+            metrics.REMINDERS.inc()
+            try:
+                result = self.notify(current[1])
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logging.exception("Reminder for task %s failed", task_id)
+        self._fired_until = now
+
+    async def _run(self) -> None:
+        if self.lock is not None and not self.lock.acquire():
+            logging.info("Reminders run in another worker; standing by")
+            while not self.lock.acquire():
+                await asyncio.sleep(self.lock_retry)
+            logging.info("Took over reminders from another worker")
+        # Take the version first so no change between it and the load is missed
+        since = await self.db.arow_version()
+        self._fired_until = time.time()
+        await self._reload()
+        reload_at = datetime.combine(date.today() + timedelta(days=1), clock()).timestamp()
+        changes = asyncio.ensure_future(self.feed.wait(since))
+        try:
+            while True:
+                await self._fire_due()
+                if time.time() >= reload_at:
+                    await self._reload()
+                    reload_at = datetime.combine(date.today() + timedelta(days=1), clock()).timestamp()
+                wake_at = min(self._heap[0][0], reload_at) if self._heap else reload_at
+                await asyncio.wait({changes}, timeout=max(0.0, wake_at - time.time()))
+                if changes.done():
+                    try:
+                        batch = changes.result()
+                    except Exception:
+                        logging.exception("Reminder change feed failed")
+                        await asyncio.sleep(self.feed.interval)
+                        batch = []
+                    if batch:
+                        since = batch[-1].version
+                    self._apply(batch)
+                    changes = asyncio.ensure_future(self.feed.wait(since))
+        finally:
+            changes.cancel()
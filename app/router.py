@@ -0,0 +1,207 @@
+# app/router.py
+import asyncio
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, List, Optional
+from .db import TodoApp
+from .date_utils import normalize_due_date
+from . import metrics
+
+# Paths reported back to callers so latency per path can be compared.
+ROUTE_FAST = "router"
+ROUTE_AGENT = "agent"
+ROUTE_CACHE = "cache"
+
+# Tasks the fast-path listing shows before summarizing the rest
+LIST_LIMIT = 50
+
+
+@dataclass
+class RouteResult:
+    output: str
+    handled_by: str
+    elapsed_ms: float
+    # Agent (action, observation) pairs, when the agent ran and returned them
+    steps: List[Any] = field(default_factory=list)
+
+
+# ---------------- Patterns ----------------
+# Only unambiguous shapes live here; anything else falls through to the agent.
+_LIST_RE = re.compile(
+    r"^(?:please\s+)?(?:show|list|view|display|get)(?:\s+me)?(?:\s+all)?(?:\s+(?:my|the))?\s+(?:tasks|todos)$"
+    r"|^(?:all\s+)?(?:tasks|todos)$"
+)
+_DELETE_RE = re.compile(r"^(?:please\s+)?(?:delete|remove)\s+(?:task\s+)?#?(\d+)$")
+_COMPLETE_RE = re.compile(
+    r"^(?:please\s+)?(?:complete|finish|done|mark)\s+(?:task\s+)?#?(\d+)"
+    r"(?:\s+(?:as\s+)?(?:done|complete|completed|finished))?$"
+)
+_REOPEN_RE = re.compile(
+    r"^(?:please\s+)?(?:reopen|uncomplete|undo)\s+(?:task\s+)?#?(\d+)$"
+    r"|^(?:please\s+)?mark\s+(?:task\s+)?#?(\d+)\s+(?:as\s+)?(?:not\s+done|incomplete|pending|open)$"
+)
+
+# Shapes that only ask for information; anything else (e.g. "buy milk tomorrow") may be a new task
+_READ_RE = re.compile(
+    r"^(?:please\s+)?(?:show|list|view|display)\b"
+    r"|^(?:find|search)\s+(?:(?:for|in)\s+)?(?:my\s+|the\s+)?(?:tasks?|todos?)\b"
+    r"|^(?:what|what's|whats|which|how many|how much|is|are|any)\b"
+    r"|^(?:when|where)\s+(?:is|are|was|were|do|does|did)\b"
+    r"|^(?:do|does|did)\s+(?:i|we|you)\s+have\b"
+    r"|^(?:the\s+)?(?:weather|forecast)\b"
+)
+# Words that can signal a change; a read shape containing any is still not read-only
+_WRITE_WORDS_RE = re.compile(
+    r"\b(?:add|create|new|make|put|delete|remove|drop|clear|complete|finish|done|mark|check|tick|"
+    r"update|edit|change|rename|set|move|reschedule|postpone|push|reopen|undo|uncomplete|cancel|remind)\b"
+)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip().lower()).rstrip(".!")
+
+
+# ---------------- Direct handlers ----------------
+# Output strings mirror the ones returned by the tools in app/tools.py so the
+# caller sees the same text regardless of which path served the request.
+def list_tasks(app: TodoApp, limit: int = LIST_LIMIT) -> str:
+    """The first `limit` tasks by ID, then a count of the ones not shown."""
+    tasks = app.list_tasks(limit=limit + 1)
+    if not tasks:
+        return "No tasks found."
+    lines = [str(task) for task in tasks[:limit]]
+    if len(tasks) > limit:
+        today = date.today().isoformat()
+        more = app.task_counts(today, today)["total"] - limit
+        lines.append(f"… {more} more task(s); search for a task or use export to see all.")
+    return "\n".join(lines)
+
+
+def add_task(app: TodoApp, title: str, description: str | None, due_date: str | None) -> str:
+    due_date_iso = normalize_due_date(due_date)
+    task_id = app.add_task(title, description or None, due_date_iso)
+    return f"Task added with ID {task_id}" + (f" (due {due_date_iso})" if due_date_iso else "")
+
+
+def delete_task(app: TodoApp, task_id: int) -> str:
+    if app.delete_task(task_id):
+        return "Task deleted successfully."
+    return "Task not found."
+
+
+def set_completed(app: TodoApp, task_id: int, completed: bool) -> str:
+    if app.update_task(task_id, completed=completed):
+        return "Task updated successfully."
+    return "Task not found or no changes made."
+
+
+def route(text: str, app: TodoApp) -> Optional[str]:
+    """Handle `text` without the LLM if it has an obvious shape.
+
+    Returns the output string, or None when the input should go to the agent.
+    """
+    d = _normalize(text)
+    if not d:
+        return None
+    if _LIST_RE.match(d):
+        return list_tasks(app)
+    m = _DELETE_RE.match(d)
+    if m:
+        return delete_task(app, int(m.group(1)))
+    m = _REOPEN_RE.match(d)
+    if m:
+        return set_completed(app, int(m.group(1) or m.group(2)), False)
+    m = _COMPLETE_RE.match(d)
+    if m:
+        return set_completed(app, int(m.group(1)), True)
+    return None
+
+
+def is_read_only(text: str) -> bool:
+    """Whether `text` reads like a question or listing rather than a change.
+
+    Conservative: it must match a known read shape and contain no word that
+    could mean a write. Plain statements ("dentist friday at 5") are not read-only.
+    """
+    d = _normalize(text)
+    return bool(_LIST_RE.match(d) or _READ_RE.match(d)) and not _WRITE_WORDS_RE.search(d)
+
+
+# ---------------- Dispatch ----------------
+class LazyAgent:
+    """Stands in for the agent executor and builds it on first use.
+
+    `factory` is expected to import the LLM stack itself, so callers that only
+    ever hit the fast path never pay for importing LangChain.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    start = time.perf_counter()
+                    self._executor = self._factory()
+                    logging.info("Agent built in %.0f ms", (time.perf_counter() - start) * 1000)
+        return self._executor
+
+    def invoke(self, *args: Any, **kwargs: Any) -> Any:
+        return self.get().invoke(*args, **kwargs)
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> Any:
+        # First use imports LangChain and builds the executor; keep that off the event loop
+        executor = self._executor or await asyncio.to_thread(self.get)
+        return await executor.ainvoke(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+def _agent_output(result: Any) -> str:
+    output = result.get("output") if isinstance(result, dict) else None
+    # Be defensive in case the agent returns something unexpected
+    return str(result) if output is None else output
+
+
+def _agent_route(result: Any) -> str:
+    return ROUTE_CACHE if isinstance(result, dict) and result.get("cached") else ROUTE_AGENT
+
+
+def _agent_steps(result: Any) -> List[Any]:
+    return list(result.get("intermediate_steps") or []) if isinstance(result, dict) else []
+
+
+def _finish(output: str, handled_by: str, start: float, steps: List[Any] | None = None) -> RouteResult:
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    metrics.ROUTED.inc(handled_by)
+    logging.info("Command handled by %s in %.1f ms", handled_by, elapsed_ms)
+    return RouteResult(output=output, handled_by=handled_by, elapsed_ms=elapsed_ms, steps=steps or [])
+
+
+def run_command(text: str, app: TodoApp, agent: Any, **extra: Any) -> RouteResult:
+    """Try the fast path, otherwise invoke the agent executor."""
+    start = time.perf_counter()
+    output = route(text, app)
+    if output is not None:
+        return _finish(output, ROUTE_FAST, start)
+    result = agent.invoke({"input": text, **extra})
+    return _finish(_agent_output(result), _agent_route(result), start, _agent_steps(result))
+
+
+async def arun_command(text: str, app: TodoApp, agent: Any, **extra: Any) -> RouteResult:
+    """Async counterpart of `run_command` for the FastAPI service."""
+    start = time.perf_counter()
+    # The fast path touches SQLite; keep it off the event loop
+    output = await asyncio.to_thread(route, text, app)
+    if output is not None:
+        return _finish(output, ROUTE_FAST, start)
+    result = await agent.ainvoke({"input": text, **extra})
+    return _finish(_agent_output(result), _agent_route(result), start, _agent_steps(result))
@@ -0,0 +1,237 @@
+# app/session.py
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Iterable, List, Tuple
+
+# Task ids as they appear in tool inputs and outputs: "Task added with ID 7",
+# compact "7|-|..." lines, str(Task) "[ ] 7. ..." lines and "task 7" / "#7" in text
+_ID_PATTERNS = re.compile(
+    r"\bIDs?\s+((?:\d+(?:,\s*)?)+)|^(\d+)\||^\[.\]\s+(\d+)\.|\btask\s+#?(\d+)|#(\d+)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _ids_in_text(text: str) -> List[int]:
+    ids = []
+    for m in _ID_PATTERNS.finditer(text or ""):
+        for group in m.groups():
+            if group:
+                ids.extend(int(x) for x in re.findall(r"\d+", group))
+    return ids
+
+
+def referenced_task_ids(user_text: str, output: str, steps: Iterable[Tuple[Any, Any]] = ()) -> List[int]:
+    """Task ids a turn touched, least to most relevant.
+
+    Ids the agent passed to a tool explicitly (task_id / task_ids) rank above
+    ids that only showed up in text, such as a listing.
+    """
+    mentioned, acted_on = [], []
+    for action, observation in steps:
+        mentioned.extend(_ids_in_text(str(observation)))
+        tool_input = getattr(action, "tool_input", None)
+        if isinstance(tool_input, dict):
+            if isinstance(tool_input.get("task_id"), int):
+                acted_on.append(tool_input["task_id"])
+            acted_on.extend(i for i in tool_input.get("task_ids") or () if isinstance(i, int))
+    return [*mentioned, *_ids_in_text(output), *_ids_in_text(user_text), *acted_on]
+
+
+class Session:
+    """One conversation: a window of recent turns and the task ids they referenced."""
+
+    def __init__(self, max_turns: int = 6, max_task_ids: int = 10, max_chars: int = 600):
+        self.turns: "deque[Tuple[str, str]]" = deque(maxlen=max_turns)
+        self.task_ids: "OrderedDict[int, None]" = OrderedDict()
+        self.max_task_ids = max_task_ids
+        # Long outputs (listings) are cut so the window stays cheap to resend
+        self.max_chars = max_chars
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _clip(self, text: str) -> str:
+        return text if len(text) <= self.max_chars else text[: self.max_chars - 1] + "…"
+
+    def record(self, user_text: str, output: str, steps: Iterable[Tuple[Any, Any]] = ()) -> None:
+        with self._lock:
+            self._apply(user_text, output, steps)
+
+    def _apply(self, user_text: str, output: str, steps: Iterable[Tuple[Any, Any]]) -> None:
+        self.turns.append((self._clip(user_text), self._clip(output or "")))
+        for task_id in referenced_task_ids(user_text, output or "", steps):
+            self.task_ids[task_id] = None
+            self.task_ids.move_to_end(task_id)
+        while len(self.task_ids) > self.max_task_ids:
+            self.task_ids.popitem(last=False)
+        self.last_used = time.monotonic()
+
+    def _dumps(self) -> str:
+        return json.dumps({"turns": list(self.turns), "task_ids": list(self.task_ids)})
+
+    def _loads(self, state: str) -> None:
+        data = json.loads(state)
+        self.turns.clear()
+        self.turns.extend(tuple(turn) for turn in data["turns"])
+        self.task_ids = OrderedDict.fromkeys(data["task_ids"])
+
+    def prompt_inputs(self) -> dict:
+        """Extra agent inputs: `chat_history` as (role, text) messages, or nothing for a new session."""
+        with self._lock:
+            if not self.turns and not self.task_ids:
+                return {}
+            history = []
+            if self.task_ids:
+                ids = ", ".join(map(str, reversed(self.task_ids)))
+                history.append(("system", f"Task IDs referenced recently in this conversation, most recent first: {ids}"))
+            for user_text, output in self.turns:
+                history.append(("human", user_text))
+                history.append(("ai", output))
+        return {"chat_history": history}
+
+
+class SessionStore:
+    """Sessions by id, LRU-bounded, dropped after `ttl` seconds idle."""
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 1800.0, max_turns: int = 6, max_task_ids: int = 10):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self.max_task_ids = max_task_ids
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Session:
+        """Return the session, starting a fresh one if it is unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = Session(self.max_turns, self.max_task_ids)
+            else:
+                session.last_used = now
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def _evict(self, now: float) -> None:
+        # Least recently used first, so stop at the first live session
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_used < self.ttl:
+                break
+            self._sessions.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def close(self) -> None:
+        pass
+
+
+class StoredSession(Session):
+    """A Session kept in a SQLiteSessionStore, so every worker process sees the same turns."""
+
+    def __init__(self, store: "SQLiteSessionStore", session_id: str, max_turns: int = 6, max_task_ids: int = 10):
+        super().__init__(max_turns, max_task_ids)
+        self.session_id = session_id
+        self._store = store
+
+    def record(self, user_text: str, output: str, steps: Iterable[Tuple[Any, Any]] = ()) -> None:
+        steps = list(steps)
+        with self._lock:
+            self._store._update(self, lambda: self._apply(user_text, output, steps))
+
+
+class SQLiteSessionStore:
+    """Same contract as SessionStore, kept in a SQLite file shared by `serve --workers` processes.
+
+    A turn is recorded by re-reading the session inside a write transaction,
+    so turns another worker recorded in the meantime are kept.
+    """
+
+    def __init__(self, path: str = "sessions.db", max_sessions: int = 1000, ttl: float = 1800.0,
+                 max_turns: int = 6, max_task_ids: int = 10):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self.max_task_ids = max_task_ids
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_used ON sessions(last_used)")
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Session:
+        """Return the session, starting a fresh one if it is unknown or expired."""
+        session = StoredSession(self, session_id, self.max_turns, self.max_task_ids)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT state FROM sessions WHERE session_id = ? AND last_used >= ?",
+                (session_id, time.time() - self.ttl),
+            ).fetchone()
+        if row is not None:
+            session._loads(row[0])
+        return session
+
+    def _update(self, session: StoredSession, apply: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT state FROM sessions WHERE session_id = ? AND last_used >= ?",
+                    (session.session_id, now - self.ttl),
+                ).fetchone()
+                if row is not None:
+                    session._loads(row[0])
+                apply()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, state, last_used) VALUES (?, ?, ?)",
+                    (session.session_id, session._dumps(), now),
+                )
+                # Expired sessions, then least recently used ones beyond the limit
+                self.conn.execute("DELETE FROM sessions WHERE last_used < ?", (now - self.ttl,))
+                self.conn.execute(
+                    """
+                    DELETE FROM sessions WHERE session_id IN (
+                        SELECT session_id FROM sessions ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_sessions,),
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def build_session_store(kind: str, path: str = "sessions.db", **options: Any):
+    """Return a session store for `kind` ("memory" or "sqlite"); `options` go to its constructor."""
+    kind = (kind or "memory").strip().lower()
+    if kind == "memory":
+        return SessionStore(**options)
+    if kind == "sqlite":
+        return SQLiteSessionStore(path, **options)
+    raise ValueError(f"Unknown session store: {kind}")
@@ -1,47 +1,211 @@
 import logging
-import requests
+from datetime import date, timedelta
+from typing import List, Optional
+from pydantic import BaseModel
 from langchain_core.tools import tool
 from .date_utils import normalize_due_date
-from .db import TodoApp
+from .weather import get_provider
+from .db import TodoApp, AsyncTodoApp
+from .models import Task
+
+# Approximate tokens a single task tool may return; listing stops there
+DEFAULT_OUTPUT_BUDGET = 800
+_PAGE = 100
+_NOTE_CHARS = 60
+_HEADER = "id|done|due|title|notes"
 
 
 @tool
 def get_weather(location: str, date: str = "today") -> str:
     """Get the weather forecast for a location on a specific date. Supports 'today' and 'tomorrow'."""
-    logging.info(f"Fetching weather for {location} on {date}")
-    param = "1" if date == "tomorrow" else "0"
-    url = f"https://wttr.in/{location}?{param}&format=Condition:+%C%0ATemperature:+%t"
+    logging.info("Fetching weather for %s on %s", location, date)
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        logging.debug(f"Weather response: {response.text.strip()}")
-        return response.text
+        text = get_provider().fetch(location, date)
+        logging.debug("Weather response: %s", text.strip())
+        return text
     except Exception as e:
-        logging.error(f"Failed to get weather: {e}")
+        logging.error("Failed to get weather: %s", e)
         return "Failed to get weather."
 
 
-def create_task_tools(app: TodoApp):
-    """Return CRUD tools bound to the provided `TodoApp` instance."""
+async def _aget_weather(location: str, date: str = "today") -> str:
+    logging.info("Fetching weather for %s on %s (async)", location, date)
+    try:
+        text = await get_provider().afetch(location, date)
+        logging.debug("Weather response: %s", text.strip())
+        return text
+    except Exception as e:
+        logging.error("Failed to get weather: %s", e)
+        return "Failed to get weather."
+
+
+# Used by `ainvoke` so the lookup never ties up a thread waiting on the network
+get_weather.coroutine = _aget_weather
+
+
+# Tools that change tasks; runs that call any of these are never response-cached
+WRITE_TOOLS = frozenset({
+    "add_task_tool", "update_task_tool", "delete_task_tool",
+    "add_tasks_tool", "update_tasks_tool", "delete_tasks_tool",
+})
+
+
+class NewTask(BaseModel):
+    title: str
+    description: Optional[str] = None
+    due_date: Optional[str] = None
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); cheap and good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def compact(task: Task) -> str:
+    """One-line `id|done|due|title|notes` encoding; about half the tokens of `str(task)`."""
+    note = (task.description or "").replace("\n", " ").replace("|", "/")
+    if len(note) > _NOTE_CHARS:
+        note = note[: _NOTE_CHARS - 1] + "…"
+    done = "x" if task.completed else "-"
+    return f"{task.id}|{done}|{task.due_date or ''}|{task.title.replace('|', '/')}|{note}"
+
+
+class OutputBudget:
+    """Collects compact task lines until roughly `tokens` are used."""
+
+    # Kept free for the truncation marker
+    _RESERVE = 30
+
+    def __init__(self, tokens: int):
+        self.left = tokens - self._RESERVE - _estimate_tokens(_HEADER)
+        self.lines: List[str] = []
+
+    def add(self, task: Task) -> bool:
+        """Append `task` if it fits; the first line is always taken so output is never empty."""
+        line = compact(task)
+        cost = _estimate_tokens(line)
+        if cost > self.left and self.lines:
+            return False
+        self.left -= cost
+        self.lines.append(line)
+        return True
+
+    def render(self, more: str | None = None) -> str:
+        text = "\n".join([_HEADER, *self.lines])
+        return f"{text}\n{more}" if more else text
+
+
+def _bind_executor(app: TodoApp, task_tool, write: bool):
+    """Give `task_tool` an async path that runs its body on the app's reader pool or writer.
+
+    Without it, `ainvoke` would run the sync body on langchain's default executor
+    against the shared connection. Plain `TodoApp` instances are left untouched.
+    """
+    if isinstance(app, AsyncTodoApp):
+        run = app.run_write if write else app.run_read
+        func = task_tool.func
+
+        async def _run(**kwargs):
+            return await run(func, **kwargs)
+
+        task_tool.coroutine = _run
+    return task_tool
+
+
+def create_task_tools(app: TodoApp, output_budget: int = DEFAULT_OUTPUT_BUDGET):
+    """Return CRUD, search and summary tools bound to the provided `TodoApp` instance.
+
+    Tools that return tasks stay within `output_budget` tokens (approximate).
+    """
+
+    def _render_tasks(tasks: List[Task], limit: int, more: str) -> str:
+        """Render up to `limit` of `tasks` (fetch limit + 1 to detect more) within the budget."""
+        out = OutputBudget(output_budget)
+        shown = 0
+        for task in tasks[:limit]:
+            if not out.add(task):
+                break
+            shown += 1
+        return out.render(more if shown < len(tasks) else None)
 
     @tool
     def add_task_tool(title: str, description: str = None, due_date: str = None) -> str:
         """Add a task with optional description and due date."""
-        logging.info(f"Tool call: add_task_tool with title={title}")
+        logging.info("Tool call: add_task_tool with title=%s", title)
         due_date_iso = normalize_due_date(due_date)
         task_id = app.add_task(title, description, due_date_iso)
-        logging.info(f"Task added with ID {task_id} via tool.")
+        logging.info("Task added with ID %s via tool.", task_id)
         return f"Task added with ID {task_id}" + (f" (due {due_date_iso})" if due_date_iso else "")
 
     @tool
-    def get_all_tasks_tool() -> str:
-        """Retrieve all tasks from the database."""
-        logging.info("Tool call: get_all_tasks_tool")
-        tasks = app.get_all_tasks()
-        if not tasks:
+    def get_all_tasks_tool(completed: bool = None, after_id: int = None) -> str:
+        """List tasks as 'id|done|due|title|notes' lines, by ID. Long lists are cut off; continue with the after_id given.
+        For counts, deadlines or a specific task, use the summary, overdue/upcoming or search tools instead."""
+        logging.info("Tool call: get_all_tasks_tool after ID %s", after_id)
+        out = OutputBudget(output_budget)
+        cursor = after_id
+        # Page through the keyset index and stop reading once the budget is spent
+        while True:
+            page = app.list_tasks(completed=completed, after_id=cursor, limit=_PAGE)
+            for task in page:
+                if not out.add(task):
+                    return out.render(
+                        f"... more tasks available; call get_all_tasks_tool(after_id={cursor}) to continue."
+                    )
+                cursor = task.id
+            if len(page) < _PAGE:
+                break
+        if not out.lines:
             logging.info("No tasks found.")
             return "No tasks found."
-        return "\n".join(str(task) for task in tasks)
+        return out.render()
+
+    @tool
+    def search_tasks_tool(query: str, limit: int = 10) -> str:
+        """Find tasks by keywords in their title or description, best matches first. Prefer this over listing all tasks."""
+        logging.info("Tool call: search_tasks_tool for '%s'", query)
+        limit = max(1, min(limit, 50))
+        tasks = app.search_tasks(query, limit=limit + 1)
+        if not tasks:
+            return "No matching tasks."
+        return _render_tasks(tasks, limit, "... more matches available; refine the query.")
+
+    @tool
+    def task_summary_tool() -> str:
+        """Count tasks: total, open, completed, overdue and due this week (through Sunday). Use for 'how many' questions."""
+        logging.info("Tool call: task_summary_tool")
+        today = date.today()
+        week_end = today + timedelta(days=6 - today.weekday())
+        c = app.task_counts(today.isoformat(), week_end.isoformat())
+        return (
+            f"total {c['total']}, open {c['open']}, completed {c['completed']}, "
+            f"overdue {c['overdue']}, due this week {c['due_this_week']} (through {week_end.isoformat()})"
+        )
+
+    @tool
+    def overdue_tasks_tool(limit: int = 10) -> str:
+        """Open tasks whose due date has passed, oldest deadline first."""
+        logging.info("Tool call: overdue_tasks_tool")
+        limit = max(1, min(limit, 50))
+        tasks = app.overdue_tasks(limit=limit + 1)
+        if not tasks:
+            return "No overdue tasks."
+        return _render_tasks(tasks, limit, "... more overdue tasks available; see task_summary_tool for the count.")
+
+    @tool
+    def upcoming_tasks_tool(limit: int = 10, within_days: int = None) -> str:
+        """Open tasks due from today on, soonest first; within_days=7 limits it to the coming week."""
+        logging.info("Tool call: upcoming_tasks_tool")
+        limit = max(1, min(limit, 50))
+        today = date.today()
+        if within_days is None:
+            tasks = app.next_due_tasks(limit + 1)
+        else:
+            due_to = today + timedelta(days=within_days)
+            tasks = app.tasks_due_between(today.isoformat(), due_to.isoformat(), limit=limit + 1)
+        if not tasks:
+            return "No upcoming tasks."
+        return _render_tasks(tasks, limit, "... more upcoming tasks available.")
 
     @tool
     def update_task_tool(
@@ -52,7 +216,7 @@ def create_task_tools(app: TodoApp):
         completed: bool = None,
     ) -> str:
         """Update a task identified by task_id with optional fields."""
-        logging.info(f"Tool call: update_task_tool for ID {task_id}")
+        logging.info("Tool call: update_task_tool for ID %s", task_id)
         due_date_iso = normalize_due_date(due_date)
         success = app.update_task(task_id, title, description, due_date_iso, completed)
         if success:
@@ -65,7 +229,7 @@ def create_task_tools(app: TodoApp):
     @tool
     def delete_task_tool(task_id: int) -> str:
         """Delete a task by task_id."""
-        logging.info(f"Tool call: delete_task_tool for ID {task_id}")
+        logging.info("Tool call: delete_task_tool for ID %s", task_id)
         success = app.delete_task(task_id)
         if success:
             logging.info("Task deleted successfully via tool.")
@@ -74,4 +238,47 @@ def create_task_tools(app: TodoApp):
             logging.warning("Task delete failed - task not found via tool.")
             return "Task not found."
 
-    return [add_task_tool, get_all_tasks_tool, update_task_tool, delete_task_tool]
\ No newline at end of file
+    @tool
+    def add_tasks_tool(tasks: List[NewTask]) -> str:
+        """Add several tasks at once. Each item has a title and optional description and due date."""
+        logging.info("Tool call: add_tasks_tool with %s task(s)", len(tasks))
+        rows = []
+        for t in tasks:
+            t = NewTask.model_validate(t)
+            rows.append((t.title, t.description, normalize_due_date(t.due_date)))
+        task_ids = app.add_tasks(rows)
+        return f"Added {len(task_ids)} task(s) with IDs {', '.join(map(str, task_ids))}"
+
+    @tool
+    def update_tasks_tool(
+        task_ids: List[int],
+        title: str = None,
+        description: str = None,
+        due_date: str = None,
+        completed: bool = None,
+    ) -> str:
+        """Apply the same changes to several tasks at once, e.g. mark tasks 3-40 completed."""
+        logging.info("Tool call: update_tasks_tool for %s ID(s)", len(task_ids))
+        count = app.update_tasks(task_ids, title, description, normalize_due_date(due_date), completed)
+        return f"Updated {count} of {len(task_ids)} task(s)."
+
+    @tool
+    def delete_tasks_tool(task_ids: List[int]) -> str:
+        """Delete several tasks at once by their IDs."""
+        logging.info("Tool call: delete_tasks_tool for %s ID(s)", len(task_ids))
+        count = app.delete_tasks(task_ids)
+        return f"Deleted {count} of {len(task_ids)} task(s)."
+
+    return [
+        _bind_executor(app, add_task_tool, write=True),
+        _bind_executor(app, get_all_tasks_tool, write=False),
+        _bind_executor(app, search_tasks_tool, write=False),
+        _bind_executor(app, task_summary_tool, write=False),
+        _bind_executor(app, overdue_tasks_tool, write=False),
+        _bind_executor(app, upcoming_tasks_tool, write=False),
+        _bind_executor(app, update_task_tool, write=True),
+        _bind_executor(app, delete_task_tool, write=True),
+        _bind_executor(app, add_tasks_tool, write=True),
+        _bind_executor(app, update_tasks_tool, write=True),
+        _bind_executor(app, delete_tasks_tool, write=True),
+    ]
\ No newline at end of file
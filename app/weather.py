@@ -0,0 +1,235 @@
+# app/weather.py
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # async client is optional; fall back to the pooled sync session in a thread
+    httpx = None
+
+WTTR_URL = "https://wttr.in"
+_FORMAT = "Condition:+%C%0ATemperature:+%t"
+
+
+def normalize_key(location: str, day: str) -> Tuple[str, str]:
+    """Cache key: case/whitespace-insensitive location and 'today'/'tomorrow'."""
+    loc = re.sub(r"\s+", " ", (location or "").strip().lower())
+    return loc, "tomorrow" if (day or "").strip().lower() == "tomorrow" else "today"
+
+
+class WeatherProvider(ABC):
+    """Source of short weather reports. Subclass and pass to `set_provider` to swap it out.
+
+    Subclasses must implement `fetch`; `afetch` defaults to running it in a thread.
+    """
+
+    @abstractmethod
+    def fetch(self, location: str, day: str) -> str:
+        ...
+
+    async def afetch(self, location: str, day: str) -> str:
+        return await asyncio.to_thread(self.fetch, location, day)
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        self.close()
+
+
+class WttrProvider(WeatherProvider):
+    """wttr.in over keep-alive connection pools (requests for sync, httpx for async)."""
+
+    def __init__(self, base_url: str = WTTR_URL, timeout: float = 5.0, pool_size: int = 10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool_size = pool_size
+        self._aclient = None
+        self._aloop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _url(self, location: str, day: str) -> str:
+        param = "1" if day == "tomorrow" else "0"
+        return f"{self.base_url}/{location}?{param}&format={_FORMAT}"
+
+    def fetch(self, location: str, day: str) -> str:
+        response = self.session.get(self._url(location, day), timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    async def afetch(self, location: str, day: str) -> str:
+        if httpx is None:
+            return await super().afetch(location, day)
+        if self._aclient is None:
+            limits = httpx.Limits(max_connections=self._pool_size, max_keepalive_connections=self._pool_size)
+            self._aclient = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+            self._aloop = asyncio.get_running_loop()
+        response = await self._aclient.get(self._url(location, day))
+        response.raise_for_status()
+        return response.text
+
+    def close(self) -> None:
+        self.session.close()
+        client, loop, self._aclient = self._aclient, self._aloop, None
+        if client is None or loop.is_closed():
+            return
+        # The async client's connections belong to the loop that created it
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            loop.run_until_complete(client.aclose())
+        except RuntimeError:
+            # Another loop is running on this thread; use aclose() from async code instead
+            logging.debug("Could not close the async weather client", exc_info=True)
+
+    async def aclose(self) -> None:
+        self.session.close()
+        client, self._aclient = self._aclient, None
+        if client is not None:
+            await client.aclose()
+
+
+class CachedWeather(WeatherProvider):
+    """TTL + LRU cache with single-flight deduplication in front of another provider.
+
+    Concurrent lookups for the same normalized (location, day) share one
+    upstream request. Failures are not cached.
+    """
+
+    def __init__(self, provider: WeatherProvider, ttl: float = 600.0, max_entries: int = 256):
+        self.provider = provider
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], threading.Event] = {}
+        self._ainflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    def _get_cached(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, text = entry
+            if expires < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return text
+
+    def _put(self, key: Tuple[str, str], text: str) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def fetch(self, location: str, day: str) -> str:
+        key = normalize_key(location, day)
+        while True:
+            cached = self._get_cached(key)
+            if cached is not None:
+                return cached
+            with self._lock:
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+            if leader:
+                break
+            # Another thread is fetching the same key; use its result or retry if it failed
+            event.wait(self._timeout())
+        try:
+            text = self.provider.fetch(*key)
+            self._put(key, text)
+            return text
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    async def afetch(self, location: str, day: str) -> str:
+        key = normalize_key(location, day)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        task = self._ainflight.get(key)
+        if task is None:
+            # Its own task, so no caller's cancellation reaches the upstream request
+            task = self._ainflight[key] = asyncio.ensure_future(self._afetch_upstream(key))
+            task.add_done_callback(lambda _: self._afetch_done(key, task))
+        return await asyncio.shield(task)
+
+    async def _afetch_upstream(self, key: Tuple[str, str]) -> str:
+        text = await self.provider.afetch(*key)
+        self._put(key, text)
+        return text
+
+    def _afetch_done(self, key: Tuple[str, str], task: asyncio.Task) -> None:
+        if self._ainflight.get(key) is task:
+            del self._ainflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody awaited doesn't log "exception was never retrieved"
+            task.exception()
+
+    def _timeout(self) -> float:
+        return getattr(self.provider, "timeout", 10.0) + 1.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        self.provider.close()
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+
+_provider: Optional[WeatherProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> WeatherProvider:
+    """Process-wide provider, built from WEATHER_BASE_URL / WEATHER_CACHE_TTL on first use."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            upstream = WttrProvider(
+                base_url=os.getenv("WEATHER_BASE_URL", WTTR_URL),
+                timeout=float(os.getenv("WEATHER_TIMEOUT", "5")),
+            )
+            _provider = CachedWeather(upstream, ttl=float(os.getenv("WEATHER_CACHE_TTL", "600")))
+            logging.debug("Weather provider ready: %s", upstream.base_url)
+        return _provider
+
+
+def set_provider(provider: Optional[WeatherProvider]) -> None:
+    """Swap the process-wide provider (e.g. a stub in tests). None resets to the default."""
+    global _provider
+    with _provider_lock:
+        old, _provider = _provider, provider
+    if old is not None and old is not provider:
+        old.close()
+
+
+async def aset_provider(provider: Optional[WeatherProvider]) -> None:
+    """`set_provider` for async callers; closes the old provider's async client on this loop."""
+    global _provider
+    with _provider_lock:
+        old, _provider = _provider, provider
+    if old is not None and old is not provider:
+        await old.aclose()
@@ -0,0 +1 @@
+# Offline benchmarks. Run a module with `python -m benchmarks.<name>` from the repo root.
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""End-to-end /agent throughput and latency through FastAPI's TestClient.
+
+    python -m benchmarks.bench_agent [--requests 200] [--tasks 200] [--llm-latency 0] [--out agent.json]
+
+ChatOpenAI is replaced by ScriptedChatModel, so no network or API key is
+needed. Scenarios: fast-path commands, agent reads and agent writes. The
+response cache is disabled so every agent request runs the executor.
+"""
+import argparse
+import functools
+import logging
+import os
+import tempfile
+import time
+from benchmarks.common import summarize, titles, write_results
+
+
+def run(requests: int, tasks: int, llm_latency: float) -> dict:
+    from fastapi.testclient import TestClient
+    from benchmarks.fake_llm import ScriptedChatModel
+    import app.api as api
+    from app.agent import create_agent_executor
+
+    # Swap the model the API builds at startup for the scripted one
+    api.create_agent_executor = functools.partial(create_agent_executor, llm=ScriptedChatModel(latency=llm_latency))
+
+    scenarios = {
+        "fast_path": lambda i: "show all tasks",
+        "agent_read": lambda i: "what do I have on my plate?",
+        "agent_write": lambda i: f"remember to water plants {i}",
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "offline-benchmark"),
+            "TODO_DB": os.path.join(tmp, "bench.db"),
+            "TODO_RESPONSE_CACHE": "off",
+            "LOG_LEVEL": "WARNING",
+        })
+        with TestClient(api.app) as client:
+            api.app.state.db.add_tasks((t, None, None) for t in titles(tasks))
+            for name, make_input in scenarios.items():
+                samples = []
+                wall = time.perf_counter()
+                for i in range(requests):
+                    start = time.perf_counter()
+                    resp = client.post("/agent", json={"input": make_input(i)})
+                    samples.append(time.perf_counter() - start)
+                    resp.raise_for_status()
+                wall = time.perf_counter() - wall
+                results[name] = {**summarize(samples), "requests_per_sec": round(requests / wall, 1),
+                                 "handled_by": resp.json().get("handled_by")}
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--tasks", type=int, default=200)
+    ap.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per model call")
+    ap.add_argument("--out")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+    results = run(args.requests, args.tasks, args.llm_latency)
+    write_results("agent_endpoint", {"requests": args.requests, "tasks": args.tasks,
+                                     "llm_latency_s": args.llm_latency, "scenarios": results}, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Microbenchmark for due-date normalization.
+
+    python -m benchmarks.bench_dates [--rounds N] [--out dates.json]
+
+Runs a corpus of realistic due-date strings through the parser with the
+memo cache disabled (every call parses) and enabled, and prints JSON.
+"""
+import argparse
+import time
+from datetime import date
+from app.date_utils import DueDateParser
+from benchmarks.common import write_results
+
+CORPUS = [
+    "today", "tomorrow", "Tomorrow", "day after tomorrow", "next week",
+    "7th october", "October 7", "7 oct 2025", "oct 7th, 2025", "1st jan",
+    "dec 25th", "25 December 2025", "31 feb", "07-10", "7/10/25",
+    "7.10.2025", "12/31", "1-1-99", "2025-10-07", "2025-1-7",
+    "friday", "next friday", "this saturday", "on monday", "sun",
+    "in 3 days", "in 2 weeks", "in 1 day", "asap", "end of month",
+    "", "sometime next year", "2025-13-01", "march 3rd 2026", "3 mar",
+]
+
+
+def run(parser: DueDateParser, rounds: int, today: date) -> dict:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser.normalize_many(CORPUS, today)
+    elapsed = time.perf_counter() - start
+    calls = rounds * len(CORPUS)
+    return {"calls": calls, "seconds": round(elapsed, 4), "calls_per_sec": round(calls / elapsed)}
+
+
+def bench(rounds: int) -> dict:
+    today = date.today()
+    return {
+        "corpus_size": len(CORPUS),
+        "uncached": run(DueDateParser(cache_size=0), rounds, today),
+        "cached": run(DueDateParser(), rounds, today),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rounds", type=int, default=2000)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+    write_results("normalize_due_date", bench(args.rounds), args.out)
+
+
+if __name__ == "__main__":
+    main()
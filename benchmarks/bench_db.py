@@ -0,0 +1,54 @@
+"""TodoApp throughput and matching latency at several table sizes.
+
+    python -m benchmarks.bench_db [--sizes 1000,10000,100000] [--out db.json]
+
+Each size gets a fresh database in a temp directory, bulk-loaded with
+deterministic titles, then measures single-row CRUD, a keyset page,
+find_task_by_title_fuzzy and upsert_task (half hits, half misses).
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+from app.db import TodoApp
+from benchmarks.common import measure, titles, write_results
+
+
+def bench_size(n: int, ops: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        app = TodoApp(db_name=os.path.join(tmp, "bench.db"))
+        names = titles(n)
+        app.add_tasks((t, None, "2025-10-07") for t in names)
+        ids = iter(range(n + 1, n + 1 + ops))
+        probe = lambda: rng.randint(1, n)
+
+        results = {
+            "add_task": measure(lambda: app.add_task(rng.choice(names) + " new", None, None), ops),
+            "get_task": measure(lambda: app.get_task(probe()), ops),
+            "update_task": measure(lambda: app.update_task(probe(), completed=True), ops),
+            "list_tasks_page": measure(lambda: app.list_tasks(completed=False, after_id=probe(), limit=50), ops),
+            "delete_task": measure(lambda: app.delete_task(next(ids)), ops),
+            "find_task_by_title_fuzzy": measure(lambda: app.find_task_by_title_fuzzy(rng.choice(names)), ops),
+        }
+        upserts = [rng.choice(names) if i % 2 else f"brand new thing {i}" for i in range(ops)]
+        it = iter(upserts)
+        results["upsert_task"] = measure(lambda: app.upsert_task(next(it), None, None), ops)
+        app.close()
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--ops", type=int, default=500)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+    logging.disable(logging.CRITICAL)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    write_results("todoapp", {"ops": args.ops, "sizes": {str(n): bench_size(n, args.ops) for n in sizes}}, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Throughput of several processes sharing one database, as with `main.py serve --workers N`.
+
+    python -m benchmarks.bench_workers [--workers 1,2,4,8] [--seconds 3] [--write-ratio 0.2] [--out workers.json]
+
+Each worker process opens its own TodoApp on a common file (WAL) and runs a
+mixed load for a fixed time: reads are get_task, a keyset page and a search;
+writes are add_task and update_task. Reports total ops/sec per worker count,
+write retries and errors, and checks that no acknowledged add was lost.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from app.db import TodoApp
+from app import metrics
+from benchmarks.common import WORDS, summarize, titles, write_results
+
+
+def _worker(db_path: str, seed: int, start_at: float, seconds: float, write_ratio: float, n: int, out) -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(seed)
+    app = TodoApp(db_name=db_path)
+    reads = writes = adds = errors = 0
+    samples = []
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        t0 = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                if rng.random() < 0.5:
+                    app.add_task(f"{rng.choice(WORDS)} {rng.choice(WORDS)} w{seed}", None, None)
+                    adds += 1
+                else:
+                    app.update_task(rng.randint(1, n), completed=rng.random() < 0.5)
+                writes += 1
+            else:
+                op = rng.random()
+                if op < 0.5:
+                    app.get_task(rng.randint(1, n))
+                elif op < 0.8:
+                    app.list_tasks(completed=False, after_id=rng.randint(1, n), limit=50)
+                else:
+                    app.search_tasks(rng.choice(WORDS), limit=10)
+                reads += 1
+        except Exception:
+            errors += 1
+        samples.append(time.perf_counter() - t0)
+    app.close()
+    out.put({
+        "reads": reads, "writes": writes, "adds": adds, "errors": errors,
+        "retries": metrics.DB_WRITE_RETRIES.value(), "samples": samples,
+    })
+
+
+def run(workers: int, seconds: float, write_ratio: float, n: int = 10000) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        app = TodoApp(db_name=db_path)
+        app.add_tasks((t, None, "2025-10-07") for t in titles(n))
+        before = len(app.get_all_tasks())
+        out = ctx.Queue()
+        # Leave time for the spawned interpreters to import and open the database
+        start_at = time.time() + 2.0
+        procs = [
+            ctx.Process(target=_worker, args=(db_path, i, start_at, seconds, write_ratio, n, out))
+            for i in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        parts = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+        after = len(app.get_all_tasks())
+        app.close()
+    samples = [s for part in parts for s in part["samples"]]
+    ops = sum(part["reads"] + part["writes"] for part in parts)
+    return {
+        "workers": workers,
+        "ops_per_sec": round(ops / seconds, 1),
+        "reads": sum(part["reads"] for part in parts),
+        "writes": sum(part["writes"] for part in parts),
+        "errors": sum(part["errors"] for part in parts),
+        "write_retries": sum(part["retries"] for part in parts),
+        # Every add_task that returned must be in the table
+        "lost_adds": sum(part["adds"] for part in parts) - (after - before),
+        "latency": summarize(samples),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--workers", default="1,2,4,8")
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--write-ratio", type=float, default=0.2)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+    logging.disable(logging.CRITICAL)
+    counts = [int(w) for w in args.workers.split(",")]
+    results = [run(w, args.seconds, args.write_ratio) for w in counts]
+    write_results(
+        "workers",
+        {"seconds": args.seconds, "write_ratio": args.write_ratio, "cpu_count": os.cpu_count(), "runs": results},
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
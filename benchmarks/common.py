@@ -0,0 +1,67 @@
+"""Shared helpers for the benchmark scripts."""
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+WORDS = (
+    "buy milk call mom dentist appointment pay rent walk dog fix car email boss "
+    "book flight renew passport clean kitchen water plants submit report review pr "
+    "plan trip order groceries pick up kids gym workout read chapter backup laptop "
+    "schedule meeting update resume cancel subscription return package"
+).split()
+
+
+def titles(n: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(2, 5))) + f" {i}" for i in range(n)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds from samples in seconds."""
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(pct(50), 4),
+        "p99_ms": round(pct(99), 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    result["ops_per_sec"] = round(len(samples) / sum(samples), 1)
+    return result
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def write_results(name: str, results: dict, out: str | None) -> None:
+    payload = {"benchmark": name, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "env": environment(), **results}
+    text = json.dumps(payload, indent=2)
+    if out:
+        with open(out, "w") as f:
+            f.write(text + "\n")
+    print(text)
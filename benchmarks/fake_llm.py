@@ -0,0 +1,59 @@
+"""Deterministic stand-in for ChatOpenAI so agent benchmarks run offline.
+
+The first turn of every request is a scripted tool call chosen from the
+input; once a tool result is in the conversation the model answers with it.
+"""
+import asyncio
+import re
+import time
+import uuid
+from typing import Any, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+def script(text: str) -> tuple[str, dict]:
+    """Pick (tool, args) for the first turn of a request."""
+    d = text.strip().lower()
+    m = re.match(r"^(?:remember to|add|i need to)\s+(.+)$", d)
+    if m:
+        return "add_task_tool", {"title": m.group(1)}
+    m = re.match(r"^(?:finish|complete|mark)\s+(?:task\s+)?(\d+)", d)
+    if m:
+        return "update_task_tool", {"task_id": int(m.group(1)), "completed": True}
+    return "get_all_tasks_tool", {}
+
+
+class ScriptedChatModel(BaseChatModel):
+    latency: float = 0.0  # simulated model time per call, in seconds
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        results = [m for m in messages if isinstance(m, ToolMessage)]
+        if results:
+            message = AIMessage(content=f"Done. {results[-1].content}")
+        else:
+            human = next(m for m in reversed(messages) if isinstance(m, HumanMessage))
+            name, args = script(str(human.content))
+            message = AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}"}])
+        message.usage_metadata = {"input_tokens": 50 * len(messages), "output_tokens": 20, "total_tokens": 50 * len(messages) + 20}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(messages)
@@ -0,0 +1,37 @@
+"""Run every benchmark and write one combined JSON file.
+
+    python -m benchmarks.run_all [--out benchmarks/results.json] [--quick]
+
+--quick uses smaller sizes for a fast smoke run.
+"""
+import argparse
+import json
+import logging
+import time
+from benchmarks import bench_agent, bench_dates, bench_db, bench_workers
+from benchmarks.common import environment
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--out", default="benchmarks/results.json")
+    ap.add_argument("--quick", action="store_true")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+    sizes = [1000, 10000] if args.quick else [1000, 10000, 100000]
+    ops = 100 if args.quick else 500
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "env": environment(),
+        "todoapp": {str(n): bench_db.bench_size(n, ops) for n in sizes},
+        "normalize_due_date": bench_dates.bench(200 if args.quick else 2000),
+        "agent_endpoint": bench_agent.run(50 if args.quick else 200, 200, 0.0),
+        "workers": [bench_workers.run(w, 1.0 if args.quick else 3.0, 0.2) for w in (1, 2, 4)],
+    }
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
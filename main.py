@@ -1,21 +1,140 @@
+import time
+
+_START = time.perf_counter()
+
 import os
+import sys
+import logging
+import argparse
 from dotenv import load_dotenv
 from app.logging_config import configure_logging
 from app.db import TodoApp
 from app.cli import run_cli
+from app.router import list_tasks, add_task, delete_task, set_completed
+from app.transfer import FORMATS, IMPORT_BATCH, export_tasks, import_tasks, parse_rows
+
+
+def _measure_import_time() -> None:
+    """Cold-start import times in fresh interpreters, so regressions show up in numbers."""
+    import json
+    import subprocess
+    results = {}
+    for module in ("main", "app.cli", "app.api", "app.agent"):
+        code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        results[module] = round(float(proc.stdout) * 1000, 1) if proc.returncode == 0 else None
+    print(json.dumps({"import_ms": results}, indent=2))
+
+
+def _format(path: str, fmt: str | None) -> str:
+    return fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+
+
+def _transfer(app: TodoApp, args: argparse.Namespace) -> None:
+    """Run export/import, reporting throughput on stderr so stdout can carry the data."""
+    if args.command == "export":
+        fmt = _format(args.output, args.format)
+        if args.output == "-":
+            stats = export_tasks(app, sys.stdout, fmt, args.chunk_size)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as out:
+                stats = export_tasks(app, out, fmt, args.chunk_size)
+        verb = "Exported"
+    else:
+        fmt = _format(args.input, args.format)
+        try:
+            if args.input == "-":
+                stats = import_tasks(app, parse_rows(sys.stdin, fmt), args.batch_size)
+            else:
+                with open(args.input, encoding="utf-8", newline="") as src:
+                    stats = import_tasks(app, parse_rows(src, fmt), args.batch_size)
+        except ValueError as e:
+            raise SystemExit(f"Import stopped at {e}; batches before it were kept.")
+        verb = "Imported"
+    print(f"{verb} {stats.rows} task(s) in {stats.seconds:.2f}s ({stats.rows_per_sec:,.0f} rows/s)", file=sys.stderr)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="AI Todo. Without a command, starts the interactive menu.")
+    parser.add_argument("--db", default="todo.db", help="SQLite database file")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("list", help="List all tasks")
+    add = sub.add_parser("add", help="Add a task")
+    add.add_argument("title")
+    add.add_argument("-d", "--description")
+    add.add_argument("--due", help="Due date, e.g. 2025-10-07, 'tomorrow', '7th october'")
+    done = sub.add_parser("done", help="Mark a task completed")
+    done.add_argument("task_id", type=int)
+    undone = sub.add_parser("undone", help="Mark a task not completed")
+    undone.add_argument("task_id", type=int)
+    delete = sub.add_parser("delete", help="Delete a task")
+    delete.add_argument("task_id", type=int)
+    sub.add_parser("rebuild-index", help="Rebuild the title token and full-text search indexes")
+    export = sub.add_parser("export", help="Export all tasks as NDJSON or CSV")
+    export.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    export.add_argument("--format", choices=FORMATS, help="Default: from the file extension, else ndjson")
+    export.add_argument("--chunk-size", type=int, default=1000)
+    import_ = sub.add_parser("import", help="Import tasks from NDJSON or CSV (ids are reassigned)")
+    import_.add_argument("input", help="Input file, or - for stdin")
+    import_.add_argument("--format", choices=FORMATS, help="Default: from the file extension, else ndjson")
+    import_.add_argument("--batch-size", type=int, default=IMPORT_BATCH, help="Rows per transaction")
+    sub.add_parser("import-time", help="Measure cold-start import time of the entry points")
+    serve = sub.add_parser("serve", help="Run the HTTP API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=1, help="Worker processes sharing the database; reminders run in one of them")
+    return parser
 
 
 def main() -> None:
+    args = _parser().parse_args()
     load_dotenv()
     configure_logging()
 
+    if args.command == "import-time":
+        _measure_import_time()
+        return
+
+    if args.command == "serve":
+        import uvicorn
+        # Workers are separate processes; they pick the database up in the API lifespan
+        os.environ["TODO_DB"] = args.db
+        os.environ["TODO_WORKERS"] = str(args.workers)
+        uvicorn.run("app.api:app", host=args.host, port=args.port, workers=args.workers)
+        return
+
+    # Non-interactive commands never touch LangChain or need an API key
+    if args.command is not None:
+        app = TodoApp(db_name=args.db)
+        try:
+            if args.command == "list":
+                print(list_tasks(app))
+            elif args.command == "add":
+                print(add_task(app, args.title, args.description, args.due))
+            elif args.command == "done":
+                print(set_completed(app, args.task_id, True))
+            elif args.command == "undone":
+                print(set_completed(app, args.task_id, False))
+            elif args.command == "delete":
+                print(delete_task(app, args.task_id))
+            elif args.command in ("export", "import"):
+                _transfer(app, args)
+            elif args.command == "rebuild-index":
+                count = app.rebuild_token_index()
+                app.rebuild_search_index()
+                print(f"Rebuilt title and search indexes for {count} task(s).")
+        finally:
+            app.close()
+        return
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise SystemExit("OPENAI_API_KEY not set. Exiting.")
 
-    app = TodoApp(db_name="todo.db")
+    app = TodoApp(db_name=args.db)
+    logging.debug("Startup took %.0f ms", (time.perf_counter() - _START) * 1000)
     run_cli(api_key, app)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
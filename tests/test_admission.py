@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from app.admission import AdmissionLimiter, Overloaded, SingleFlight
+
+
+class AdmissionLimiterTest(unittest.TestCase):
+    def test_full_queue_is_rejected_with_retry_after(self):
+        async def run():
+            limiter = AdmissionLimiter(max_concurrent=2, max_queue=1, min_retry_after=1)
+            release = asyncio.Event()
+
+            async def work():
+                await release.wait()
+                return "ok"
+
+            admitted = [asyncio.ensure_future(limiter.run(work)) for _ in range(3)]
+            await asyncio.sleep(0)
+            self.assertEqual((limiter.running, limiter.waiting), (2, 1))
+            with self.assertRaises(Overloaded) as rejected:
+                await limiter.run(work)
+            self.assertGreaterEqual(rejected.exception.retry_after, 1)
+            release.set()
+            self.assertEqual(await asyncio.gather(*admitted), ["ok"] * 3)
+            # Slots free again once the backlog has drained
+            self.assertEqual(await limiter.run(work), "ok")
+            self.assertEqual((limiter.running, limiter.waiting), (0, 0))
+
+        asyncio.run(run())
+
+    def test_retry_after_grows_with_run_time_and_backlog(self):
+        limiter = AdmissionLimiter(max_concurrent=2, max_queue=4, min_retry_after=1)
+        limiter._avg_seconds = 3.0
+        limiter.waiting = 3
+        self.assertEqual(limiter.retry_after(), 6)
+        limiter.waiting = 0
+        self.assertEqual(limiter.retry_after(), 2)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_callers_share_one_run(self):
+        async def run():
+            flight, calls = SingleFlight(), []
+
+            async def work():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return "result"
+
+            results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+            self.assertEqual(len(flight), 0)
+            return results, calls
+
+        results, calls = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True])
+
+    def test_one_caller_giving_up_does_not_cancel_the_others(self):
+        async def run():
+            flight = SingleFlight()
+
+            async def work():
+                await asyncio.sleep(0.05)
+                return "result"
+
+            impatient = asyncio.ensure_future(asyncio.wait_for(flight.do("key", work), 0.01))
+            patient = asyncio.ensure_future(flight.do("key", work))
+            with self.assertRaises(asyncio.TimeoutError):
+                await impatient
+            result, _ = await patient
+            return result, len(flight)
+
+        self.assertEqual(asyncio.run(run()), ("result", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
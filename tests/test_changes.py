@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from app.changes import ChangeFeed
+from app.db import AsyncTodoApp
+
+
+class ChangesSinceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = AsyncTodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def pages(self, since, limit):
+        """Page the feed the way /tasks/changes clients do: fetch limit + 1, resume from the last version."""
+        pages = []
+        while True:
+            changes = self.db.changes_since(since, limit + 1)
+            pages.append(changes[:limit])
+            if len(changes) <= limit:
+                return pages
+            since = changes[limit - 1].version
+
+    def test_paging_returns_each_task_once_in_its_latest_state(self):
+        ids = [self.db.add_task(f"task {i}", None, None) for i in range(7)]
+        start = self.db.row_version
+        self.db.update_task(ids[0], title="renamed")
+        self.db.update_task(ids[0], completed=True)
+        self.db.delete_task(ids[1])
+        self.db.add_task("late", None, None)
+        self.db.delete_tasks(ids[5:])
+
+        pages = self.pages(start, 2)
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        changes = [c for page in pages for c in page]
+        versions = [c.version for c in changes]
+        self.assertEqual(versions, sorted(versions))
+        self.assertEqual(versions[-1], self.db.row_version)
+        by_id = {c.task_id: c for c in changes}
+        self.assertEqual(len(by_id), len(changes))
+        self.assertEqual((by_id[ids[0]].task.title, by_id[ids[0]].task.completed), ("renamed", True))
+        for task_id in (ids[1], ids[5], ids[6]):
+            self.assertIsNone(by_id[task_id].task)
+        self.assertEqual(self.pages(self.db.row_version, 2), [[]])
+
+    def test_from_zero_covers_every_task(self):
+        for i in range(5):
+            self.db.add_task(f"task {i}", None, None)
+        changes = [c for page in self.pages(0, 2) for c in page]
+        self.assertEqual(sorted(c.task_id for c in changes), [t.id for t in self.db.get_all_tasks()])
+
+
+class ChangeFeedTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = AsyncTodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_wait_fetches_one_past_the_batch_limit(self):
+        for title in ("a", "b", "c"):
+            self.db.add_task(title, None, None)
+
+        async def run():
+            feed = ChangeFeed(self.db, interval=0.01, batch_limit=2)
+            try:
+                return await asyncio.wait_for(feed.wait(0), timeout=5)
+            finally:
+                feed.close()
+
+        # The third change is how a pager (the WebSocket) knows to set has_more
+        self.assertEqual([c.task.title for c in asyncio.run(run())], ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
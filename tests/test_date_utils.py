@@ -0,0 +1,109 @@
+import itertools
+import re
+import unittest
+from datetime import date, datetime as _dt, timedelta
+
+from app.date_utils import DueDateParser, normalize_due_date, normalize_many
+from benchmarks.bench_dates import CORPUS
+
+TODAY = date(2025, 10, 7)
+
+
+def legacy_normalize(due, today):
+    """normalize_due_date as it was before DueDateParser, with `today` passed in."""
+    if not due:
+        return None
+    d = due.strip().lower().replace(",", "")
+    if d == "today":
+        return today.isoformat()
+    if d == "tomorrow":
+        return (today + timedelta(days=1)).isoformat()
+    d = re.sub(r"(\d{1,2})(st|nd|rd|th)\b", r"\1", d)
+    months = {
+        "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+        "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+        "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9,
+        "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+    }
+    parts = d.split()
+    if len(parts) in (2, 3):
+        if parts[0].isdigit() and parts[1] in months:
+            year = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else today.year
+            try:
+                return date(year, months[parts[1]], int(parts[0])).isoformat()
+            except ValueError:
+                pass
+        if parts[0] in months and parts[1].isdigit():
+            year = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else today.year
+            try:
+                return date(year, months[parts[0]], int(parts[1])).isoformat()
+            except ValueError:
+                pass
+    m = re.match(r"^(\d{1,2})[-/.](\d{1,2})(?:[-/.](\d{2,4}))?$", d)
+    if m:
+        day, month, y = m.groups()
+        year = today.year if y is None else int(y) + (2000 if int(y) < 100 else 0)
+        try:
+            return date(year, int(month), int(day)).isoformat()
+        except ValueError:
+            pass
+    try:
+        return _dt.strptime(d, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        pass
+    return due
+
+
+def corpus():
+    """Inputs in every shape the legacy function handled, valid or not, plus the benchmark corpus."""
+    days = ["0", "1", "07", "7", "12", "29", "30", "31", "32", "1st", "2nd", "3rd", "22nd", "31st"]
+    names = ["jan", "February", "mar", "sept", "OCT", "december", "foo"]
+    years = ["", " 25", " 2025", " 2024", " 99999"]
+    for day, name, year in itertools.product(days, names, years):
+        yield f"{day} {name}{year}"
+        yield f"{name} {day},{year}"
+    numbers = ["0", "1", "07", "12", "13", "29", "31"]
+    for day, month, sep, year in itertools.product(numbers, numbers, "-/.", ["", "25", "2024", "999"]):
+        yield f"{day}{sep}{month}" + (f"{sep}{year}" if year else "")
+    for y, m, d in itertools.product(["2024", "2025", "1999"], ["1", "01", "02", "12", "13"], ["1", "07", "29", "30", "31"]):
+        yield f"{y}-{m}-{d}"
+    yield from ["Today", " tomorrow ", "TODAY", "", None, "whenever", "2025-10-07T09:00"]
+    yield from CORPUS
+
+
+class DueDateParserTest(unittest.TestCase):
+    def test_formats_the_old_parser_handled_give_identical_output(self):
+        checked = 0
+        for text in corpus():
+            expected = legacy_normalize(text, TODAY)
+            if expected == text:
+                # Left as free text before; the new parser may now understand it
+                continue
+            with self.subTest(text=text):
+                self.assertEqual(normalize_due_date(text, TODAY), expected)
+            checked += 1
+        self.assertGreater(checked, 500)
+
+    def test_relative_forms(self):
+        # 2025-10-07 is a Tuesday
+        cases = {
+            "next friday": "2025-10-10", "friday": "2025-10-10", "tuesday": "2025-10-07",
+            "next tuesday": "2025-10-14", "in 3 days": "2025-10-10", "in 2 weeks": "2025-10-21",
+            "next week": "2025-10-14", "day after tomorrow": "2025-10-09",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(normalize_due_date(text, TODAY), expected)
+
+    def test_batch_matches_single_calls_and_memoizes(self):
+        parser = DueDateParser()
+        values = list(CORPUS) * 3
+        self.assertEqual(parser.normalize_many(values, TODAY), [parser.normalize(v, TODAY) for v in values])
+        self.assertGreater(parser.cache_info().hits, 0)
+        self.assertEqual(normalize_many(["tomorrow"], TODAY), ["2025-10-08"])
+        # The memo is keyed by today as well
+        self.assertEqual(parser.normalize("tomorrow", TODAY + timedelta(days=1)), "2025-10-09")
+
+
+if __name__ == "__main__":
+    unittest.main()
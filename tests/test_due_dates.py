@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from app.date_utils import epoch_day
+from app.db import TodoApp
+
+
+class DueDayTest(unittest.TestCase):
+    """tasks.due_day: the indexed epoch-day form of due_date."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = TodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def add(self, title, due, completed=False):
+        task_id = self.db.add_task(title, None, due)
+        if completed:
+            self.db.update_task(task_id, completed=True)
+        return task_id
+
+    def titles(self, tasks):
+        return [t.title for t in tasks]
+
+    def test_due_day_follows_due_date_on_every_write(self):
+        task_id = self.add("a", "2025-10-07")
+        self.db.update_task(task_id, due_date="2025-10-09T10:00")
+        self.db.add_tasks([("b", None, "sometime"), ("c", None, None)])
+        self.db.update_tasks([task_id], due_date="not a date")
+        rows = self.db.conn.execute("SELECT title, due_day FROM tasks ORDER BY id").fetchall()
+        self.assertEqual(rows, [("a", None), ("b", None), ("c", None)])
+        self.db.update_task(task_id, due_date="2025-10-09T10:00")
+        self.assertEqual(self.db.conn.execute("SELECT due_day FROM tasks WHERE id = ?", (task_id,)).fetchone()[0],
+                         epoch_day("2025-10-09"))
+
+    def test_overdue_and_upcoming_boundaries(self):
+        self.add("yesterday", "2025-10-06")
+        self.add("today", "2025-10-07")
+        self.add("week end", "2025-10-14")
+        self.add("after", "2025-10-15")
+        self.add("done late", "2025-10-01", completed=True)
+        self.add("free text", "someday")
+        self.assertEqual(self.titles(self.db.overdue_tasks("2025-10-07")), ["yesterday"])
+        self.assertEqual(self.titles(self.db.tasks_due_between("2025-10-07", "2025-10-14")), ["today", "week end"])
+        self.assertEqual(self.titles(self.db.next_due_tasks(2, "2025-10-07")), ["today", "week end"])
+        self.assertEqual(
+            self.titles(self.db.tasks_due_between("2025-10-01", "2025-10-06", completed=None)), ["done late", "yesterday"]
+        )
+        counts = self.db.task_counts("2025-10-07", "2025-10-14")
+        self.assertEqual((counts["overdue"], counts["due_this_week"], counts["open"]), (1, 2, 5))
+
+    def test_list_tasks_due_range_skips_free_text_and_rejects_non_dates(self):
+        self.db.add_task("Dentist", None, "2025-10-07")
+        self.db.add_task("Taxes", None, "2025-10-08T09:00")
+        self.db.add_task("Novel", None, "sometime next year")
+        self.db.add_task("Gym", None, None)
+        tasks = self.db.list_tasks(due_from="2025-10-07", due_to="2025-10-08")
+        self.assertEqual([t.title for t in tasks], ["Dentist", "Taxes"])
+        self.assertEqual([t.title for t in self.db.list_tasks(due_from="2025-10-08")], ["Taxes"])
+        with self.assertRaises(ValueError):
+            self.db.list_tasks(due_from="next week")
+
+    def test_due_range_alone_is_served_by_an_index(self):
+        plan = self.db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE due_day >= ? AND due_day <= ? AND id > ? ORDER BY id LIMIT 50",
+            (1, 2, 0),
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn("idx_tasks_due_day", details)
+
+
+class DueDayMigrationTest(unittest.TestCase):
+    def test_existing_rows_are_backfilled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "todo.db")
+            conn = sqlite3.connect(path)
+            conn.executescript(
+                """
+                CREATE TABLE tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,
+                    description TEXT, due_date TEXT, completed BOOLEAN NOT NULL
+                );
+                INSERT INTO tasks (title, description, due_date, completed) VALUES
+                    ('iso', NULL, '2025-10-07', 0), ('with time', NULL, '2025-10-08 09:30', 0),
+                    ('free text', NULL, 'next spring', 0), ('none', NULL, NULL, 0),
+                    ('epoch', NULL, '1970-01-01', 0);
+                """
+            )
+            conn.close()
+            db = TodoApp(db_name=path)
+            try:
+                rows = db.conn.execute("SELECT title, due_day FROM tasks ORDER BY id").fetchall()
+                self.assertEqual(rows, [
+                    ("iso", epoch_day("2025-10-07")), ("with time", epoch_day("2025-10-08")),
+                    ("free text", None), ("none", None), ("epoch", 0),
+                ])
+                self.assertEqual([t.title for t in db.overdue_tasks("2025-10-08")], ["epoch", "iso"])
+            finally:
+                db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import unittest
+
+from app.db import TodoApp
+
+_WORDS = ["buy", "milk", "call", "mom", "the", "dentist", "report", "pay", "rent", "go", "gym", "tax", "car", "wash", "to"]
+
+
+def scan_match(tasks, title, threshold):
+    """The original full-table Jaccard scan the token index replaced."""
+    target = TodoApp._tokenize(title)
+    if not target:
+        return None
+    best, best_score = None, 0.0
+    for task in tasks:
+        tokens = TodoApp._tokenize(task.title)
+        union = target | tokens
+        if not union:
+            continue
+        score = len(target & tokens) / len(union)
+        if score > best_score:
+            best_score, best = score, task
+    return best if best is not None and best_score >= threshold else None
+
+
+class FuzzyTitleIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = TodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+        self.rng = random.Random(7)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def title(self):
+        return " ".join(self.rng.choice(_WORDS) for _ in range(self.rng.randint(1, 4)))
+
+    def assert_same_as_scan(self):
+        tasks = self.db.get_all_tasks()
+        for _ in range(200):
+            query = self.title()
+            for threshold in (0.2, 0.5, 0.8):
+                with self.subTest(query=query, threshold=threshold):
+                    expected = scan_match(tasks, query, threshold)
+                    got = self.db.find_task_by_title_fuzzy(query, threshold)
+                    self.assertEqual(got and got.id, expected and expected.id)
+
+    def test_matches_the_full_scan_through_adds_updates_and_deletes(self):
+        ids = [self.db.add_task(self.title(), None, None) for _ in range(60)]
+        ids += self.db.add_tasks([(self.title(), None, None) for _ in range(20)])
+        for task_id in self.rng.sample(ids, 15):
+            self.db.update_task(task_id, title=self.title())
+        self.db.update_tasks(self.rng.sample(ids, 5), title=self.title())
+        gone = self.rng.sample(ids, 10)
+        self.db.delete_task(gone[0])
+        self.db.delete_tasks(gone[1:])
+        self.db.upsert_task(self.title(), None, None)
+        self.assert_same_as_scan()
+
+    def test_rebuild_reproduces_the_incremental_index(self):
+        for _ in range(40):
+            self.db.add_task(self.title(), None, None)
+        before = self.db.conn.execute("SELECT token, task_id FROM task_tokens ORDER BY 1, 2").fetchall()
+        self.db.conn.execute("DELETE FROM task_tokens")
+        self.db.conn.commit()
+        self.assertEqual(self.db.rebuild_token_index(), 40)
+        after = self.db.conn.execute("SELECT token, task_id FROM task_tokens ORDER BY 1, 2").fetchall()
+        self.assertEqual(after, before)
+        self.assert_same_as_scan()
+
+
+if __name__ == "__main__":
+    unittest.main()
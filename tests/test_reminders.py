@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+
+from app.reminders import LeaderLock
+
+
+class LeaderLockTest(unittest.TestCase):
+    """Only one `serve --workers` process may run the reminder scheduler."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "todo.db.reminders.lock")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_second_holder_waits_until_release(self):
+        first, second = LeaderLock(self.path), LeaderLock(self.path)
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        second.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
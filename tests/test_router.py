@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from app.db import TodoApp
+from app.router import is_read_only, list_tasks
+
+
+class IsReadOnlyTest(unittest.TestCase):
+    """Only read-only inputs may share one /agent run (single-flight)."""
+
+    def test_statements_that_create_tasks_are_not_read_only(self):
+        for text in ["buy milk tomorrow", "dentist friday at 5", "I finished the report", "do the laundry", "find a plumber"]:
+            with self.subTest(text=text):
+                self.assertFalse(is_read_only(text))
+
+    def test_questions_and_listings_are_read_only(self):
+        for text in ["show my tasks", "tasks", "What's due today?", "how many tasks are open", "weather in Paris"]:
+            with self.subTest(text=text):
+                self.assertTrue(is_read_only(text))
+
+    def test_read_shape_with_a_write_word_is_not_read_only(self):
+        self.assertFalse(is_read_only("what should I add"))
+        self.assertFalse(is_read_only(""))
+
+
+class ListTasksTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = TodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_listing_is_capped_with_a_count_of_the_rest(self):
+        self.assertEqual(list_tasks(self.db), "No tasks found.")
+        self.db.add_tasks([(f"task {i}", None, None) for i in range(5)])
+        lines = list_tasks(self.db, limit=3).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[2].startswith("[ ] 3. task 2"))
+        self.assertIn("2 more", lines[3])
+        self.assertEqual(len(list_tasks(self.db, limit=5).splitlines()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
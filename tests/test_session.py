@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from app.session import SQLiteSessionStore
+
+
+class SQLiteSessionStoreTest(unittest.TestCase):
+    """Sessions shared by `serve --workers` processes (one store per process)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "sessions.db")
+        self.worker_a = SQLiteSessionStore(path, max_turns=3)
+        self.worker_b = SQLiteSessionStore(path, max_turns=3)
+
+    def tearDown(self):
+        self.worker_a.close()
+        self.worker_b.close()
+        self.tmp.cleanup()
+
+    def test_turns_recorded_by_one_worker_are_seen_by_another(self):
+        self.worker_a.get("s1").record("add buy milk", "Task added with ID 7")
+        history = self.worker_b.get("s1").prompt_inputs()["chat_history"]
+        self.assertIn(("human", "add buy milk"), history)
+        self.assertIn("7", history[0][1])
+        self.assertEqual(self.worker_b.get("other").prompt_inputs(), {})
+
+    def test_interleaved_records_keep_both_turns(self):
+        a, b = self.worker_a.get("s1"), self.worker_b.get("s1")
+        a.record("first", "one")
+        b.record("second", "two")
+        turns = [t for t in self.worker_a.get("s1").turns]
+        self.assertEqual(turns, [("first", "one"), ("second", "two")])
+
+    def test_expired_session_starts_fresh(self):
+        self.worker_a.get("s1").record("first", "one")
+        self.worker_b.ttl = -1
+        self.assertEqual(self.worker_b.get("s1").prompt_inputs(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
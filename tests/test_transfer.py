@@ -0,0 +1,100 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from app import transfer
+from app.db import TodoApp
+
+TASKS = [
+    ("Buy milk", None, "2025-10-07", False),
+    ("Report, \"Q3\"", "line one\nline two \u2028 sep", "someday", True),
+    ("Café ☕", None, None, False),
+]
+
+
+class ImportTasksTest(unittest.TestCase):
+    """TodoApp.import_tasks stamps rows itself instead of running the insert triggers."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = TodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_imported_rows_match_rows_added_one_by_one(self):
+        self.db.add_task("Buy milk", None, "2025-10-07")
+        since = self.db.row_version
+        count = self.db.import_tasks([
+            ("buy milk ", None, "2025-10-08", False),
+            ("Call mom", "about the trip", "2025-10-09", True),
+            ("Call mom", None, "someday", False),
+        ])
+        self.assertEqual(count, 3)
+        rows = self.db.conn.execute("SELECT title, title_key, due_day FROM tasks ORDER BY id").fetchall()
+        self.assertEqual(rows, [
+            ("Buy milk", "buy milk", 20368),
+            ("buy milk ", None, 20369),
+            ("Call mom", "call mom", 20370),
+            ("Call mom", None, None),
+        ])
+        # One distinct version per row, and the counter moved past them
+        changes = self.db.changes_since(since)
+        self.assertEqual([c.version for c in changes], [since + 1, since + 2, since + 3])
+        self.assertEqual(self.db.row_version, since + 3)
+        self.assertEqual([t.title for t in self.db.search_tasks("trip")], ["Call mom"])
+        self.assertEqual(self.db.find_task_by_title("CALL MOM").title, "Call mom")
+
+
+class TransferTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = TodoApp(db_name=os.path.join(self.tmp.name, "source.db"))
+        self.target = TodoApp(db_name=os.path.join(self.tmp.name, "target.db"))
+        for title, description, due, completed in TASKS:
+            task_id = self.source.add_task(title, description, due)
+            if completed:
+                self.source.update_task(task_id, completed=True)
+
+    def tearDown(self):
+        self.source.close()
+        self.target.close()
+        self.tmp.cleanup()
+
+    def rows(self, app):
+        return [(t.title, t.description, t.due_date, bool(t.completed)) for t in app.get_all_tasks()]
+
+    def test_round_trip_keeps_every_field(self):
+        for fmt in transfer.FORMATS:
+            with self.subTest(fmt=fmt):
+                out = io.StringIO()
+                stats = transfer.export_tasks(self.source, out, fmt, chunk_size=2)
+                self.assertEqual(stats.rows, 3)
+                # Bytes arriving in awkward pieces, as from an HTTP body
+                data = out.getvalue().encode()
+                chunks = (data[i:i + 5] for i in range(0, len(data), 5))
+                rows = transfer.parse_rows(transfer.iter_lines(chunks), fmt)
+                stats = transfer.import_tasks(self.target, rows, batch_size=2, today=date(2025, 1, 1))
+                self.assertEqual(stats.rows, 3)
+                self.assertEqual(self.rows(self.target)[-3:], self.rows(self.source))
+
+    def test_bad_line_stops_the_import_after_the_batches_before_it(self):
+        lines = [
+            '{"title": "a"}\n', '{"title": "b", "due_date": "tomorrow"}\n',
+            '{"title": "c"}\n', "{not json\n", '{"title": "e"}\n',
+        ]
+        with self.assertRaisesRegex(ValueError, "line 4"):
+            transfer.import_tasks(self.target, transfer.parse_rows(lines), batch_size=2, today=date(2025, 1, 1))
+        # The first batch was written (with its due date normalized); the one holding the bad line was not
+        self.assertEqual(self.rows(self.target), [("a", None, None, False), ("b", None, "2025-01-02", False)])
+
+    def test_missing_title_is_an_error(self):
+        with self.assertRaisesRegex(ValueError, "line 2: missing title"):
+            list(transfer.parse_rows(io.StringIO("title,completed\n,1\n"), "csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from app.db import TodoApp
+
+
+class UpsertTaskTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "todo.db")
+        self.db = TodoApp(db_name=self.path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_exact_match_updates_without_burning_an_id(self):
+        first, updated, _ = self.db.upsert_task("Buy milk", None, None)
+        self.assertFalse(updated)
+        for due in ("2025-10-07", "2025-10-08"):
+            task_id, updated, before = self.db.upsert_task(" buy MILK", "2 litres", due, use_fuzzy=False)
+            self.assertEqual((task_id, updated), (first, True))
+        self.assertEqual(before.due_date, "2025-10-07")
+        self.assertEqual(self.db.add_task("Call mom", None, None), first + 1)
+        task = self.db.find_task_by_title("buy milk")
+        self.assertEqual((task.description, task.due_date), ("2 litres", "2025-10-08"))
+
+    def test_concurrent_upserts_from_two_connections_create_one_task(self):
+        # Two TodoApps on one file stand in for two worker processes
+        other = TodoApp(db_name=self.path)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def upsert(app, n):
+            barrier.wait()
+            results.append(app.upsert_task("Water plants", f"try {n}", None, use_fuzzy=False))
+
+        threads = [threading.Thread(target=upsert, args=(self.db if n % 2 else other, n)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        other.close()
+        self.assertEqual(len({task_id for task_id, _, _ in results}), 1)
+        self.assertEqual(sum(not updated for _, updated, _ in results), 1)
+        self.assertEqual([t.title for t in self.db.get_all_tasks()], ["Water plants"])
+
+
+class TitleKeyMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "todo.db")
+        # A database from before title_key, with case/space duplicates
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            """
+            CREATE TABLE tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,
+                description TEXT, due_date TEXT, completed BOOLEAN NOT NULL
+            );
+            INSERT INTO tasks (title, description, due_date, completed) VALUES
+                ('Buy milk', NULL, NULL, 0), ('buy milk ', 'dup', NULL, 0),
+                ('Call mom', NULL, NULL, 1), ('BUY MILK', 'dup 2', NULL, 0);
+            """
+        )
+        conn.close()
+        self.db = TodoApp(db_name=self.path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def keys(self):
+        return self.db.conn.execute("SELECT id, title_key FROM tasks ORDER BY id").fetchall()
+
+    def test_oldest_duplicate_holds_the_key_and_hands_it_on(self):
+        self.assertEqual(self.keys(), [(1, "buy milk"), (2, None), (3, "call mom"), (4, None)])
+        self.db.delete_task(1)
+        self.assertEqual(self.keys(), [(2, "buy milk"), (3, "call mom"), (4, None)])
+        self.db.update_task(2, title="Buy oat milk")
+        self.assertEqual(self.keys(), [(2, "buy oat milk"), (3, "call mom"), (4, "buy milk")])
+        task_id, updated, _ = self.db.upsert_task("buy milk", "now", None, use_fuzzy=False)
+        self.assertEqual((task_id, updated), (4, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
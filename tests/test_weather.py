@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from app.weather import CachedWeather, WeatherProvider
+
+
+class SlowProvider(WeatherProvider):
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, location, day):
+        raise AssertionError("the async path must not fall back to fetch")
+
+    async def afetch(self, location, day):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return f"{location} {day}: sunny"
+
+
+class CachedWeatherTest(unittest.TestCase):
+    def test_provider_without_fetch_fails_when_instantiated(self):
+        class NoFetch(WeatherProvider):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoFetch()
+
+    def test_cancelled_first_caller_does_not_fail_followers(self):
+        upstream = SlowProvider()
+        weather = CachedWeather(upstream)
+
+        async def run():
+            first = asyncio.ensure_future(weather.afetch("Paris", "today"))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(weather.afetch(" paris ", "today"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            return await asyncio.wait_for(follower, timeout=5)
+
+        self.assertEqual(asyncio.run(run()), "paris today: sunny")
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(weather._get_cached(("paris", "today")), "paris today: sunny")
+
+
+if __name__ == "__main__":
+    unittest.main()
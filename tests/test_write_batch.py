@@ -0,0 +1,74 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from app.db import AsyncTodoApp
+
+
+class WriteBatchTest(unittest.TestCase):
+    """Regressions for grouping a turn's writes (ParallelAgentExecutor)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = AsyncTodoApp(db_name=os.path.join(self.tmp.name, "todo.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def titles(self):
+        return sorted(t.title for t in self.db.get_all_tasks())
+
+    def test_outside_write_during_batch_does_not_deadlock(self):
+        def slow_add(title):
+            task_id = self.db.add_task(title, None, None)
+            time.sleep(0.1)
+            return task_id
+
+        async def run():
+            batch = asyncio.ensure_future(
+                self.db.run_write(self.db.write_batch, [lambda: slow_add("a"), lambda: slow_add("b")])
+            )
+            await asyncio.sleep(0.02)
+            # Another request's write queued behind the batch on the writer
+            other = self.db.aadd_task("c", None, None)
+            return await asyncio.wait_for(asyncio.gather(batch, other), timeout=5)
+
+        (ids, other_id) = asyncio.run(run())
+        self.assertEqual(len(ids), 2)
+        self.assertNotIn(other_id, ids)
+        self.assertEqual(self.titles(), ["a", "b", "c"])
+
+    def test_cancelled_caller_leaves_app_writable(self):
+        def slow_add(title):
+            time.sleep(0.1)
+            return self.db.add_task(title, None, None)
+
+        async def run():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self.db.run_write(self.db.write_batch, [lambda: slow_add("a"), lambda: slow_add("b")]),
+                    timeout=0.01,
+                )
+            # Later writes (and close, in tearDown) must not hang
+            await asyncio.wait_for(self.db.aadd_task("c", None, None), timeout=5)
+
+        asyncio.run(run())
+        self.assertEqual(self.titles(), ["a", "b", "c"])
+        self.assertFalse(self.db.conn.in_transaction)
+
+    def test_failed_call_rolls_back_only_itself(self):
+        def failing():
+            self.db.add_task("lost", None, None)
+            raise ValueError("boom")
+
+        results = self.db.write_batch([lambda: self.db.add_task("a", None, None), failing])
+        self.assertIsInstance(results[0], int)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(self.titles(), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()